@@ -1,9 +1,14 @@
 import os
 import sys
+import tempfile
 import psycopg2
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Skip GUI backend probing on headless servers
 import matplotlib.pyplot as plt
-import seaborn as sns
+
+plt.style.use('seaborn-v0_8-whitegrid')
 from dotenv import load_dotenv
 
 # --- CONFIGURATION ---
@@ -17,11 +22,35 @@ DB_USER = os.getenv("POSTGRES_USER")
 DB_PASSWORD = os.getenv("POSTGRES_PASSWORD")
 
 
+INDEXES_SQL_PATH = os.path.join(os.path.dirname(__file__), 'sql', 'indexes.sql')
+
+
+def ensure_indexes(conn):
+    """Creates the indexes the analysis queries rely on (idempotent)."""
+    with open(INDEXES_SQL_PATH) as f:
+        indexes_sql = f.read()
+    with conn.cursor() as cur:
+        cur.execute(indexes_sql)
+    conn.commit()
+
+
 def connect_to_db():
     """Establishes a connection to the PostgreSQL database."""
-    conn_string = f"host='{DB_HOST}' port='{DB_PORT}' dbname='{DB_NAME}' user='{DB_USER}' password='{DB_PASSWORD}'"
     try:
-        conn = psycopg2.connect(conn_string)
+        # Keyword form instead of an interpolated DSN string: no quoting issues
+        # with special characters in the password, and no DSN re-parsing.
+        conn = psycopg2.connect(
+            host=DB_HOST,
+            port=DB_PORT,
+            dbname=DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            application_name='trace_analysis',
+            connect_timeout=5,
+            # Abort runaway analytic queries instead of hanging the run
+            options='-c statement_timeout=60000'
+        )
+        ensure_indexes(conn)
         print("Database connection established.")
         return conn
     except psycopg2.OperationalError as e:
@@ -37,16 +66,16 @@ def fetch_all_recommendation_data(conn):
     """
     print("Fetching recommendation data from the database...")
     query = """
-            SELECT r.log_id, \
-                   r.session_id, \
-                   r.depth, \
-                   r.recommendation_rank, \
-                   r.was_selected, \
-                   r.choice_method, \
-                   p.profile_name, -- The name of the profile that made the choice \
-                   v.title         AS recommended_video_title, \
-                   v.channel_title AS recommended_channel_title, \
-                   v.category_id   AS recommended_category_id, \
+            SELECT r.log_id,
+                   r.session_id,
+                   r.depth,
+                   r.recommendation_rank,
+                   r.was_selected,
+                   r.choice_method,
+                   p.profile_name, -- The name of the profile that made the choice
+                   v.title         AS recommended_video_title,
+                   v.channel_title AS recommended_channel_title,
+                   v.category_id   AS recommended_category_id,
                    source_v.title  AS source_video_title
             FROM recommendation_log r
                      JOIN videos v ON r.recommended_video_id = v.video_youtube_id
@@ -54,16 +83,220 @@ def fetch_all_recommendation_data(conn):
                      LEFT JOIN profiles p ON r.profile_id_at_choice = p.profile_id
                      LEFT JOIN videos source_v ON r.source_video_id = source_v.video_youtube_id
             -- Only analyze the main persona/experiment phase, not the initial context-setting
-            WHERE r.was_during_context = FALSE; \
+            WHERE r.was_during_context = FALSE
             """
-    df = pd.read_sql_query(query, conn)
+
+    # Stream the result server-side with COPY instead of pd.read_sql_query: this avoids
+    # the per-row DB-API tuple allocation and is several times faster on large result sets.
+    copy_sql = f"COPY ({query}) TO STDOUT WITH CSV HEADER"
+
+    # A spooled temp file keeps small results in memory but spills large ones
+    # to disk, and the chunked parse bounds peak memory during CSV decoding.
+    with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as buf:
+        with conn.cursor() as cur:
+            cur.copy_expert(copy_sql, buf)
+        buf.seek(0)
+
+        chunks = pd.read_csv(
+            buf,
+            dtype={
+                'depth': 'int32',
+                'recommendation_rank': 'int16',
+                'was_selected': 'bool',
+                'recommended_category_id': 'Int16',
+            },
+            # Postgres CSV output encodes booleans as 't'/'f'
+            true_values=['t'],
+            false_values=['f'],
+            engine='c',
+            # Arrow-backed columns: one buffer per string column instead of a
+            # PyObject per cell, and comparisons/group-bys run in C.
+            dtype_backend='pyarrow',
+            chunksize=500_000
+        )
+        df = pd.concat(chunks, ignore_index=True)
+
+    # Low-cardinality string columns: categoricals make the downstream
+    # nunique/value_counts reductions operate on small integer codes.
+    for column in ('profile_name', 'choice_method', 'recommended_channel_title'):
+        df[column] = df[column].astype('category')
+
     print(f"Successfully fetched {len(df)} recommendation log entries.")
     return df
 
 
+def fetch_diversity_summary(conn):
+    """
+    Computes the per-group diversity counts server-side instead of shipping every
+    log row to pandas. Returns two dicts keyed by profile name and by choice
+    method, each mapping to the aggregate counts for that group.
+    """
+    print("Fetching diversity summary from the database...")
+    query = """
+            SELECT p.profile_name,
+                   r.choice_method,
+                   COUNT(*)                                                AS total_recommendations,
+                   COUNT(DISTINCT v.channel_title)                         AS unique_recommended_channels,
+                   COUNT(*) FILTER (WHERE r.was_selected)                  AS total_selections,
+                   COUNT(DISTINCT v.channel_title)
+                       FILTER (WHERE r.was_selected)                       AS unique_selected_channels
+            FROM recommendation_log r
+                     JOIN videos v ON r.recommended_video_id = v.video_youtube_id
+                     LEFT JOIN profiles p ON r.profile_id_at_choice = p.profile_id
+            WHERE r.was_during_context = FALSE
+            GROUP BY GROUPING SETS ((p.profile_name), (r.choice_method))
+            """
+    by_profile, by_choice_method = {}, {}
+    with conn.cursor() as cur:
+        cur.execute(query)
+        for profile_name, choice_method, total, uniq_rec, total_sel, uniq_sel in cur.fetchall():
+            stats = {
+                'total_recommendations': total,
+                'unique_recommended_channels': uniq_rec,
+                'total_selections': total_sel,
+                'unique_selected_channels': uniq_sel
+            }
+            if profile_name is not None:
+                by_profile[profile_name] = stats
+            elif choice_method is not None:
+                by_choice_method[choice_method] = stats
+    return by_profile, by_choice_method
+
+
+def fetch_top_selected_channels(conn, limit=5):
+    """
+    Fetches the most frequently selected channels per profile and per choice
+    method, ranked server-side so only O(groups * limit) rows leave Postgres.
+    """
+    query = """
+            SELECT group_kind, group_name, channel_title, selection_count
+            FROM (SELECT 'profile'                      AS group_kind,
+                         p.profile_name                 AS group_name,
+                         v.channel_title,
+                         COUNT(*)                       AS selection_count,
+                         ROW_NUMBER() OVER (PARTITION BY p.profile_name
+                             ORDER BY COUNT(*) DESC)    AS channel_rank
+                  FROM recommendation_log r
+                           JOIN videos v ON r.recommended_video_id = v.video_youtube_id
+                           JOIN profiles p ON r.profile_id_at_choice = p.profile_id
+                  WHERE r.was_during_context = FALSE
+                    AND r.was_selected
+                  GROUP BY p.profile_name, v.channel_title
+                  UNION ALL
+                  SELECT 'choice_method'                AS group_kind,
+                         r.choice_method                AS group_name,
+                         v.channel_title,
+                         COUNT(*)                       AS selection_count,
+                         ROW_NUMBER() OVER (PARTITION BY r.choice_method
+                             ORDER BY COUNT(*) DESC)    AS channel_rank
+                  FROM recommendation_log r
+                           JOIN videos v ON r.recommended_video_id = v.video_youtube_id
+                  WHERE r.was_during_context = FALSE
+                    AND r.was_selected
+                    AND r.choice_method IS NOT NULL
+                  GROUP BY r.choice_method, v.channel_title) ranked
+            WHERE channel_rank <= %(limit)s
+            ORDER BY group_kind, group_name, selection_count DESC
+            """
+    top_channels = {}
+    with conn.cursor() as cur:
+        cur.execute(query, {'limit': limit})
+        for group_kind, group_name, channel_title, selection_count in cur.fetchall():
+            top_channels.setdefault((group_kind, group_name), []).append(
+                (channel_title, selection_count)
+            )
+    return top_channels
+
+
+def print_group_summary(stats, top_channels, title_prefix):
+    """
+    Prints the summary for one experimental group from the pre-aggregated
+    counts returned by `fetch_diversity_summary` / `fetch_top_selected_channels`.
+    """
+    if not stats or not stats['total_recommendations']:
+        print(f"\n--- No data for {title_prefix}. Skipping analysis. ---")
+        return None
+
+    print(f"\n--- Analysis for '{title_prefix}' ---")
+
+    print(f"\nOverall Recommendation Diversity:")
+    print(f"  Total recommendations shown: {stats['total_recommendations']}")
+    print(f"  Unique channels recommended: {stats['unique_recommended_channels']}")
+
+    if not stats['total_selections']:
+        print("\nNo videos were selected in this data subset.")
+        return {
+            'unique_recommended_channels': stats['unique_recommended_channels'],
+            'unique_selected_channels': 0
+        }
+
+    print(f"\nSelected Video Diversity:")
+    print(f"  Total videos selected: {stats['total_selections']}")
+    print(f"  Unique channels selected: {stats['unique_selected_channels']}")
+
+    print("\nTop 5 most selected channels:")
+    for channel_title, selection_count in top_channels or []:
+        print(f"  {channel_title}: {selection_count}")
+
+    return {
+        'unique_recommended_channels': stats['unique_recommended_channels'],
+        'unique_selected_channels': stats['unique_selected_channels']
+    }
+
+
+def analyze_all_groups(df_all):
+    """
+    Runs the dataframe summary for every persona plus the random baseline.
+
+    A single groupby walks the frame once instead of allocating one
+    boolean-masked copy per experimental group.
+    """
+    results = {}
+    for profile_name, group in df_all.groupby('profile_name', observed=True):
+        results[profile_name] = analyze_and_print_summary(group, f"{profile_name} Persona")
+    random_rows = df_all.loc[df_all['choice_method'].eq('random')]
+    results['Random Baseline'] = analyze_and_print_summary(random_rows, "Random Choice Baseline")
+    return results
+
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the pandas reductions are used throughout
+    njit = None
+
+# Below this many selected rows, JIT warmup costs more than it saves
+_JIT_MIN_ROWS = 500_000
+
+if njit is not None:
+    @njit(cache=True)
+    def _bincount_codes(codes, n_cat):
+        counts = np.zeros(n_cat, np.int64)
+        for i in range(codes.size):
+            # factorize emits -1 for NaN (unenriched videos have NULL
+            # channel_title); a negative index would wrap around and
+            # inflate the last category, so skip it like pandas does
+            if codes[i] >= 0:
+                counts[codes[i]] += 1
+        return counts
+
+
+def _unique_channel_count(series):
+    """
+    Counts distinct values, using the categorical codes when available so the
+    reduction runs on small integers instead of hashing Python strings.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.remove_unused_categories().cat.categories.size
+    return series.nunique()
+
+
 def analyze_and_print_summary(df, title_prefix):
     """
     Analyzes and prints a summary for a given subset of the data (e.g., a specific persona).
+
+    Kept for ad-hoc dataframe subsets (e.g. in notebooks); the main pipeline now
+    uses the server-side aggregates from `fetch_diversity_summary`.
     """
     if df.empty:
         print(f"\n--- No data for {title_prefix}. Skipping analysis. ---")
@@ -73,26 +306,43 @@ def analyze_and_print_summary(df, title_prefix):
 
     # Analyze the diversity of ALL videos that were recommended
     total_recommendations = len(df)
-    unique_recommended_channels = df['recommended_channel_title'].nunique()
+    unique_recommended_channels = _unique_channel_count(df['recommended_channel_title'])
     print(f"\nOverall Recommendation Diversity:")
     print(f"  Total recommendations shown: {total_recommendations}")
     print(f"  Unique channels recommended: {unique_recommended_channels}")
 
-    # Isolate only the videos that were actually selected
-    df_selected = df[df['was_selected'] == True].copy()
-    if df_selected.empty:
+    # Reductions over the selected videos work directly off a boolean mask:
+    # no intermediate DataFrame copy is materialized.
+    selected_mask = df['was_selected'].to_numpy()
+    total_selections = int(selected_mask.sum())
+    if total_selections == 0:
         print("\nNo videos were selected in this data subset.")
         return {'unique_recommended_channels': unique_recommended_channels, 'unique_selected_channels': 0}
 
     # Analyze the diversity of the SELECTED videos
-    total_selections = len(df_selected)
-    unique_selected_channels = df_selected['recommended_channel_title'].nunique()
+    selected_channels = df['recommended_channel_title'][selected_mask]
+    if njit is not None and total_selections >= _JIT_MIN_ROWS:
+        # One JIT-compiled pass over the factorized codes computes the
+        # histogram without per-row Python dispatch; unique count and top-5
+        # fall out of it directly.
+        codes, uniques = pd.factorize(selected_channels)
+        counts = _bincount_codes(codes.astype(np.int64, copy=False), len(uniques))
+        unique_selected_channels = int((counts > 0).sum())
+        k = min(5, len(uniques))
+        top_idx = np.argpartition(-counts, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-counts[top_idx])]
+        top_channels = pd.Series(counts[top_idx], index=uniques[top_idx])
+    else:
+        unique_selected_channels = _unique_channel_count(selected_channels)
+        # nlargest only partially sorts the histogram, unlike
+        # value_counts().head(5) which sorts every unique channel.
+        top_channels = selected_channels.groupby(
+            selected_channels, observed=True, sort=False
+        ).size().nlargest(5)
+
     print(f"\nSelected Video Diversity:")
     print(f"  Total videos selected: {total_selections}")
     print(f"  Unique channels selected: {unique_selected_channels}")
-
-    # Show the top 5 most frequently selected channels
-    top_channels = df_selected['recommended_channel_title'].value_counts().head(5)
     print("\nTop 5 most selected channels:")
     print(top_channels.to_string())
 
@@ -108,25 +358,27 @@ def main():
     if not conn:
         return
 
-    # Fetch all relevant data in a single query
-    df_all = fetch_all_recommendation_data(conn)
-    if df_all.empty:
+    # Aggregate server-side: only the per-group counts leave the database,
+    # instead of the full recommendation log.
+    by_profile, by_choice_method = fetch_diversity_summary(conn)
+    if not by_profile and not by_choice_method:
         print("No recommendation data found in the database. Exiting.")
         conn.close()
         return
-
-    # --- DATA SUBSETTING ---
-    # Create different dataframes for each experimental group you want to analyze
-    df_palestine = df_all[df_all['profile_name'] == 'Pro-Palestine'].copy()
-    df_israel = df_all[df_all['profile_name'] == 'Pro-Israel'].copy()
-    df_random = df_all[df_all['choice_method'] == 'random'].copy()
+    top_channels = fetch_top_selected_channels(conn)
 
     # --- ANALYSIS ---
-    # Run the analysis for each group
+    # Run the analysis for each experimental group you want to analyze
     analysis_results = {}
-    analysis_results['Pro-Palestine'] = analyze_and_print_summary(df_palestine, "Pro-Palestine Persona")
-    analysis_results['Pro-Israel'] = analyze_and_print_summary(df_israel, "Pro-Israel Persona")
-    analysis_results['Random Baseline'] = analyze_and_print_summary(df_random, "Random Choice Baseline")
+    analysis_results['Pro-Palestine'] = print_group_summary(
+        by_profile.get('Pro-Palestine'), top_channels.get(('profile', 'Pro-Palestine')),
+        "Pro-Palestine Persona")
+    analysis_results['Pro-Israel'] = print_group_summary(
+        by_profile.get('Pro-Israel'), top_channels.get(('profile', 'Pro-Israel')),
+        "Pro-Israel Persona")
+    analysis_results['Random Baseline'] = print_group_summary(
+        by_choice_method.get('random'), top_channels.get(('choice_method', 'random')),
+        "Random Choice Baseline")
 
     # --- VISUALIZATION ---
     print("\n--- Generating Visualizations ---")
@@ -139,34 +391,36 @@ def main():
         conn.close()
         return
 
-    # 1. Compare diversity of SELECTED channels (Filter Bubble Analysis)
     labels = list(valid_results.keys())
     selected_diversity = [res['unique_selected_channels'] for res in valid_results.values()]
+    recommended_diversity = [res['unique_recommended_channels'] for res in valid_results.values()]
 
-    plt.figure(figsize=(12, 7))
-    sns.barplot(x=labels, y=selected_diversity)
-    plt.title('Comparison of Selected Channel Diversity (Filter Bubble Effect)', fontsize=16)
-    plt.ylabel('Number of Unique Channels Selected', fontsize=12)
-    plt.xticks(rotation=10)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    plt.savefig('selected_channel_diversity.png')
-    print("Saved selected channel diversity comparison to 'selected_channel_diversity.png'")
-    plt.close()
+    # One figure with two axes: figure construction (font cache, artist init)
+    # is the expensive part of matplotlib, so pay for it once.
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+
+    # Bars are already aggregated scalars, so plain ax.bar avoids seaborn's
+    # aggregation/CI machinery (and the seaborn import) entirely.
+    bar_colors = ['#4C72B0', '#DD8452', '#55A868'][:len(labels)]
+
+    # 1. Compare diversity of SELECTED channels (Filter Bubble Analysis)
+    ax1.bar(labels, selected_diversity, color=bar_colors)
+    ax1.set_title('Comparison of Selected Channel Diversity (Filter Bubble Effect)', fontsize=14)
+    ax1.set_ylabel('Number of Unique Channels Selected', fontsize=12)
+    ax1.tick_params(axis='x', rotation=10)
+    ax1.grid(axis='y', linestyle='--', alpha=0.7)
 
     # 2. Compare diversity of ALL RECOMMENDED channels (Algorithmic Curation Analysis)
-    recommended_diversity = [res['unique_recommended_channels'] for res in valid_results.values()]
+    ax2.bar(labels, recommended_diversity, color=bar_colors)
+    ax2.set_title('Comparison of Overall Recommended Channel Diversity', fontsize=14)
+    ax2.set_ylabel('Total Unique Channels Recommended', fontsize=12)
+    ax2.tick_params(axis='x', rotation=10)
+    ax2.grid(axis='y', linestyle='--', alpha=0.7)
 
-    plt.figure(figsize=(12, 7))
-    sns.barplot(x=labels, y=recommended_diversity)
-    plt.title('Comparison of Overall Recommended Channel Diversity', fontsize=16)
-    plt.ylabel('Total Unique Channels Recommended', fontsize=12)
-    plt.xticks(rotation=10)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    plt.savefig('recommended_channel_diversity.png')
-    print("Saved recommended channel diversity comparison to 'recommended_channel_diversity.png'")
-    plt.close()
+    fig.tight_layout()
+    fig.savefig('channel_diversity.png', dpi=120)
+    print("Saved channel diversity comparisons to 'channel_diversity.png'")
+    plt.close(fig)
 
     conn.close()
     print("\nAnalysis complete.")
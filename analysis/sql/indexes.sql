@@ -0,0 +1,19 @@
+-- Indexes for the analysis queries over recommendation_log.
+-- All statements are idempotent (IF NOT EXISTS) so they can be applied on
+-- every analysis run against databases initialised before these existed.
+
+-- Partial index matching the analysis filter on the persona phase.
+CREATE INDEX IF NOT EXISTS idx_rlog_nonctx_recvid
+    ON recommendation_log (recommended_video_id)
+    WHERE was_during_context = FALSE;
+
+-- Foreign-key join columns used by the analysis joins.
+CREATE INDEX IF NOT EXISTS idx_rlog_profile
+    ON recommendation_log (profile_id_at_choice);
+
+CREATE INDEX IF NOT EXISTS idx_rlog_source
+    ON recommendation_log (source_video_id);
+
+-- Covering index so the videos join can be answered with an index-only scan.
+CREATE INDEX IF NOT EXISTS idx_videos_pk_covering
+    ON videos (video_youtube_id) INCLUDE (title, channel_title, category_id);
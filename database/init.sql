@@ -35,6 +35,9 @@ CREATE TABLE videos (
     channel_title VARCHAR(255),
     published_at TIMESTAMP WITH TIME ZONE,
     transcript TEXT,
+    -- Set when the transcript is permanently missing (e.g. disabled on the video),
+    -- so the enrichment worker never retries the fetch
+    transcript_unavailable BOOLEAN NOT NULL DEFAULT FALSE,
     duration_seconds INT,
     tags TEXT[],
     category_id VARCHAR(10),
@@ -75,6 +78,20 @@ CREATE TABLE persona_filter_logs (
 );
 
 
+-- Notify the enrichment worker as soon as a new video row appears, so it can
+-- wake immediately instead of waiting for its next poll interval
+CREATE OR REPLACE FUNCTION notify_new_video() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('new_video', NEW.video_youtube_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_videos_notify_new
+    AFTER INSERT ON videos
+    FOR EACH ROW EXECUTE FUNCTION notify_new_video();
+
+
 -- Create essential indexes for performance
 CREATE INDEX idx_log_session_depth ON recommendation_log(session_id, depth);
 CREATE INDEX idx_log_source_video ON recommendation_log(source_video_id);
@@ -83,6 +100,11 @@ CREATE INDEX idx_log_recommended_video ON recommendation_log(recommended_video_i
 -- A unique constraint to ensure only one video can be selected at each step of a session
 CREATE UNIQUE INDEX idx_log_unique_selection ON recommendation_log(session_id, depth) WHERE was_selected = TRUE;
 
+-- Covering index for the GUI status poll: the per-session context/persona
+-- counts and last-phase lookup all resolve with index-only scans
+CREATE INDEX idx_log_session_status ON recommendation_log(session_id, was_during_context, was_selected)
+    INCLUDE (source_video_id, depth);
+
 
 -- --- DEFAULT DATA ---
 
@@ -1,10 +1,14 @@
+import functools
 import os
+import select
 import time
 import psycopg2
+from psycopg2 import pool
+from psycopg2.extras import execute_values
+from concurrent.futures import ThreadPoolExecutor
 from googleapiclient.discovery import build
-from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 from youtube_transcript_api.proxies import WebshareProxyConfig
-import re
 
 # --- CONFIGURATION ---
 DATABASE_URL = os.environ.get("DATABASE_URL")
@@ -13,33 +17,64 @@ WEBSHARE_PROXY_USERNAME = os.environ.get("WEBSHARE_PROXY_USERNAME")
 WEBSHARE_PROXY_PASSWORD = os.environ.get("WEBSHARE_PROXY_PASSWORD")
 
 # --- ENRICHMENT WORKER LOGIC ---
+
+# Many videos share the same rounded duration, so memoize parses (bounded).
+_DURATION_CACHE = {}
+_DURATION_CACHE_MAX = 4096
+
+
 def parse_iso8601_duration(duration_str):
     """
     Parses an ISO 8601 duration string (e.g., PT1M30S) into total seconds.
+
+    Single-pass scan over the designators instead of a regex: the format is
+    narrow enough that accumulating digits and branching on the unit character
+    is several times faster than the regex engine.
     """
-    if not duration_str:
+    if not duration_str or len(duration_str) < 3 or not duration_str.startswith('PT'):
         return 0
 
-    # Regex to extract hours, minutes, and seconds from the ISO 8601 string
-    match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration_str)
-    if not match:
-        return 0
+    cached = _DURATION_CACHE.get(duration_str)
+    if cached is not None:
+        return cached
 
-    hours = int(match.group(1)) if match.group(1) else 0
-    minutes = int(match.group(2)) if match.group(2) else 0
-    seconds = int(match.group(3)) if match.group(3) else 0
+    total_seconds = 0
+    acc = 0
+    for char in duration_str[2:]:
+        ordinal = ord(char)
+        if 48 <= ordinal <= 57:  # '0'..'9'
+            acc = acc * 10 + (ordinal - 48)
+        elif char == 'H':
+            total_seconds += acc * 3600
+            acc = 0
+        elif char == 'M':
+            total_seconds += acc * 60
+            acc = 0
+        elif char == 'S':
+            total_seconds += acc
+            acc = 0
+        else:
+            # Unexpected designator (e.g. a date component): same result as
+            # the old regex, which only matched the PT time section.
+            return 0
 
-    total_seconds = hours * 3600 + minutes * 60 + seconds
+    if len(_DURATION_CACHE) >= _DURATION_CACHE_MAX:
+        _DURATION_CACHE.clear()
+    _DURATION_CACHE[duration_str] = total_seconds
     return total_seconds
 
 
-def connect_to_db(max_retries=5, delay=5):
-    """Attempts to connect to the database with retries."""
+def create_connection_pool(max_retries=5, delay=5):
+    """Creates the database connection pool, retrying until the DB is up."""
     for attempt in range(max_retries):
         try:
-            conn = psycopg2.connect(DATABASE_URL)
-            print("Database connection established.")
-            return conn
+            db_pool = psycopg2.pool.ThreadedConnectionPool(
+                1, 8, DATABASE_URL,
+                connect_timeout=5,
+                application_name='enrichment'
+            )
+            print("Database connection pool initialized.")
+            return db_pool
         except psycopg2.OperationalError as e:
             print(f"Database connection attempt {attempt + 1}/{max_retries} failed: {e}")
             if attempt + 1 == max_retries:
@@ -48,9 +83,30 @@ def connect_to_db(max_retries=5, delay=5):
             print(f"Retrying in {delay} seconds...")
             time.sleep(delay)
 
+def create_listen_connection():
+    """Dedicated autocommit connection used only for LISTEN/NOTIFY wake-ups."""
+    listen_conn = psycopg2.connect(
+        DATABASE_URL, connect_timeout=5, application_name='enrichment_listen'
+    )
+    listen_conn.autocommit = True
+    with listen_conn.cursor() as cur:
+        cur.execute("LISTEN new_video;")
+    return listen_conn
+
+
+def wait_for_new_video(listen_conn, timeout=60):
+    """Blocks until a new-video NOTIFY arrives or the timeout elapses."""
+    if select.select([listen_conn], [], [], timeout) == ([], [], []):
+        return  # Timed out: fall through to the regular poll as a safety net
+    listen_conn.poll()
+    while listen_conn.notifies:
+        listen_conn.notifies.pop(0)
+
+
 def main():
     print("Starting enrichment worker...")
-    conn = connect_to_db()
+    db_pool = create_connection_pool()
+    listen_conn = create_listen_connection()
     youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
 
     if WEBSHARE_PROXY_USERNAME and WEBSHARE_PROXY_PASSWORD:
@@ -61,13 +117,44 @@ def main():
     else:
         ytt_api = YouTubeTranscriptApi()
 
+    # Memoized across poll cycles so a video re-selected after a failed batch
+    # never triggers a duplicate transcript download.
+    @functools.lru_cache(maxsize=10_000)
+    def fetch_transcript(video_id):
+        """Returns (transcript, permanently_unavailable) for a video."""
+        try:
+            # Iterate the fetched transcript directly and feed str.join a
+            # generator: no to_raw_data() list and no intermediate list of
+            # segment strings for long transcripts.
+            return " ".join(segment.text for segment in ytt_api.fetch(video_id)), False
+        except (TranscriptsDisabled, NoTranscriptFound) as e:
+            print(f"Transcript permanently unavailable for {video_id}: {e}")
+            return None, True
+        except Exception as e:
+            print(f"Could not get transcript for {video_id}: {e}")
+            return None, False
+
     while True:
+        conn = None
         try:
+            conn = db_pool.getconn()
             cur = conn.cursor()
 
-            # Find videos that need enrichment
-            cur.execute("SELECT video_youtube_id FROM videos WHERE last_enriched_at IS NULL LIMIT 50;")
-            video_ids = [row[0] for row in cur.fetchall()]
+            # Find videos that need enrichment. A named server-side cursor streams
+            # the IDs instead of materializing the result client-side first, and
+            # FOR UPDATE SKIP LOCKED claims the rows so concurrent workers never
+            # enrich the same batch. The locks last until the batch UPDATE commits.
+            with conn.cursor(name='find_videos') as select_cur:
+                select_cur.itersize = 50
+                select_cur.execute(
+                    """SELECT video_youtube_id FROM videos
+                       WHERE last_enriched_at IS NULL
+                         AND NOT transcript_unavailable
+                       ORDER BY video_youtube_id
+                       FOR UPDATE SKIP LOCKED
+                       LIMIT 50;"""
+                )
+                video_ids = [row[0] for row in select_cur]
 
             if video_ids:
                 print(f"Found {len(video_ids)} videos to enrich.")
@@ -78,9 +165,19 @@ def main():
                         id=",".join(video_ids)
                     )
                     response = request.execute()
+                    items_by_id = {item["id"]: item for item in response.get("items", [])}
 
-                    for item in response.get("items", []):
-                        video_id = item["id"]
+                    # --- TRANSCRIPT API ---
+                    # Each transcript fetch is a blocking HTTPS round trip, so run the
+                    # batch through a thread pool instead of serializing the RTTs.
+                    with ThreadPoolExecutor(max_workers=16) as executor:
+                        transcripts = dict(zip(
+                            items_by_id.keys(),
+                            executor.map(fetch_transcript, items_by_id.keys())
+                        ))
+
+                    enriched_rows = []
+                    for video_id, item in items_by_id.items():
                         snippet = item.get("snippet", {})
                         content_details = item.get("contentDetails", {})
                         statistics = item.get("statistics", {})
@@ -88,41 +185,44 @@ def main():
                         iso_duration = content_details.get("duration")
                         duration_in_seconds = parse_iso8601_duration(iso_duration)
 
-                        # --- TRANSCRIPT API ---
-                        try:
-                            transcript_list = ytt_api.fetch(video_id).to_raw_data()
-                            transcript = " ".join([t["text"] for t in transcript_list])
-                        except Exception as e:
-                            transcript = None
-                            print(f"Could not get transcript for {video_id}: {e}")
-
-                        # --- UPDATE DATABASE ---
-                        # --- UPDATE DATABASE ---
-                        cur.execute(
+                        transcript, transcript_unavailable = transcripts.get(video_id, (None, False))
+                        enriched_rows.append((
+                            snippet.get("title"),
+                            snippet.get("description"),
+                            snippet.get("channelId"),
+                            snippet.get("channelTitle"),
+                            snippet.get("publishedAt"),
+                            transcript,
+                            transcript_unavailable,
+                            snippet.get("tags"),
+                            snippet.get("categoryId"),
+                            duration_in_seconds,
+                            video_id
+                        ))
+
+                    # --- UPDATE DATABASE ---
+                    # One batched UPDATE ... FROM VALUES instead of a round trip per video.
+                    if enriched_rows:
+                        execute_values(
+                            cur,
                             """UPDATE videos
-                               SET title            = %s,
-                                   description      = %s,
-                                   channel_id       = %s,
-                                   channel_title    = %s,
-                                   published_at     = %s,
-                                   transcript       = %s,
-                                   tags             = %s,
-                                   category_id      = %s,
-                                   duration_seconds = %s,
+                               SET title            = v.title,
+                                   description      = v.description,
+                                   channel_id       = v.channel_id,
+                                   channel_title    = v.channel_title,
+                                   published_at     = v.published_at::timestamptz,
+                                   transcript       = v.transcript,
+                                   transcript_unavailable = v.transcript_unavailable::boolean,
+                                   tags             = v.tags::text[],
+                                   category_id      = v.category_id,
+                                   duration_seconds = v.duration_seconds,
                                    last_enriched_at = NOW()
-                               WHERE video_youtube_id = %s;""",
-                            (
-                                snippet.get("title"),
-                                snippet.get("description"),
-                                snippet.get("channelId"),
-                                snippet.get("channelTitle"),
-                                snippet.get("publishedAt"),
-                                transcript,
-                                snippet.get("tags"),
-                                snippet.get("categoryId"),
-                                duration_in_seconds,
-                                video_id
-                            )
+                               FROM (VALUES %s) AS v(title, description, channel_id, channel_title,
+                                                     published_at, transcript, transcript_unavailable,
+                                                     tags, category_id, duration_seconds, vid)
+                               WHERE videos.video_youtube_id = v.vid;""",
+                            enriched_rows,
+                            page_size=50
                         )
                     conn.commit()
                     print(f"Successfully enriched {len(video_ids)} videos.")
@@ -133,18 +233,38 @@ def main():
             
             else:
                 print("No videos to enrich. Waiting...")
+                # Close the transaction opened by the named cursor
+                conn.commit()
 
             cur.close()
 
         except (psycopg2.InterfaceError, psycopg2.OperationalError) as e:
-            print(f"Database connection lost: {e}. Reconnecting...")
-            conn.close()
-            conn = connect_to_db()
-        
+            print(f"Database connection lost: {e}. Discarding connection...")
+            if conn:
+                db_pool.putconn(conn, close=True)
+                conn = None
+
         except Exception as e:
             print(f"An unexpected error occurred in the main loop: {e}")
 
-        time.sleep(60) # Wait for a minute before checking for new tasks
+        finally:
+            if conn:
+                db_pool.putconn(conn)
+
+        # Wake immediately when the insert trigger fires NOTIFY new_video;
+        # the 60-second timeout stays as a safety-net poll interval.
+        try:
+            wait_for_new_video(listen_conn, timeout=60)
+        except Exception as e:
+            print(f"LISTEN connection lost: {e}. Re-establishing...")
+            try:
+                listen_conn.close()
+            except Exception:
+                pass
+            try:
+                listen_conn = create_listen_connection()
+            except psycopg2.OperationalError:
+                time.sleep(60)
 
 if __name__ == "__main__":
     main()
@@ -1,16 +1,40 @@
+import base64
 import os
-import uuid
-import subprocess
+import time
+from datetime import datetime
 import yaml
+try:
+    from yaml import CSafeDumper as YamlDumper  # libyaml C extension
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
 import json
+import orjson
 import docker
-import psycopg2
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import JSONProvider
+from waitress import serve
 from dotenv import load_dotenv
 
 load_dotenv()
 
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson's C serializer: noticeably faster than
+    the stdlib json module on the large status and table-browser payloads."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 SETTINGS_FILE = '/app/settings.json'
 
@@ -26,7 +50,70 @@ DEFAULT_SETTINGS = {
 # Cache for auto-detected Docker configuration
 _docker_network = None
 _scraper_image = None
-_vnc_host = None
+# Resolved at import when the env var is set; otherwise detected lazily from
+# the first request's Host header
+_vnc_host = os.environ.get('VNC_HOST')
+
+# Shared docker SDK client plus a short-TTL cache of the container listing:
+# the status endpoint is polled frequently, and enumerating every container
+# on the host for each poll is the expensive part.
+_docker_client = None
+_containers_cache = None
+_containers_cache_at = 0.0
+_CONTAINERS_TTL = 1.0
+
+def docker_client():
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = docker.from_env()
+    return _docker_client
+
+def list_containers():
+    """containers.list(all=True), cached for up to a second between polls."""
+    global _containers_cache, _containers_cache_at
+    now = time.monotonic()
+    if _containers_cache is None or now - _containers_cache_at > _CONTAINERS_TTL:
+        _containers_cache = docker_client().containers.list(all=True)
+        _containers_cache_at = now
+    return _containers_cache
+
+def invalidate_container_cache():
+    """Drop the cached listing after starting/stopping/removing a container."""
+    global _containers_cache
+    _containers_cache = None
+
+# Probing every selenium node used to mean 11 sequential docker execs per
+# running scraper per poll. Probe them in parallel instead, and cache the
+# result briefly since node occupancy changes slowly.
+_SELENIUM_NODE_COUNT = 11
+_active_nodes_cache = None
+_active_nodes_cache_at = 0.0
+_ACTIVE_NODES_TTL = 2.0
+
+def _node_active(node_num):
+    try:
+        node_container = docker_client().containers.get(f'selenium_node_{node_num}')
+        result = node_container.exec_run(
+            'sh -c "ps aux | grep -i chromium | grep -v grep | grep -v java"',
+            demux=False
+        )
+        return result.exit_code == 0 and bool(result.output and result.output.strip())
+    except Exception:
+        return False
+
+def get_active_nodes():
+    """Selenium nodes with a live browser, probed in parallel and cached briefly."""
+    global _active_nodes_cache, _active_nodes_cache_at
+    now = time.monotonic()
+    if _active_nodes_cache is None or now - _active_nodes_cache_at > _ACTIVE_NODES_TTL:
+        node_nums = range(1, _SELENIUM_NODE_COUNT + 1)
+        with ThreadPoolExecutor(max_workers=_SELENIUM_NODE_COUNT) as executor:
+            _active_nodes_cache = [
+                n for n, active in zip(node_nums, executor.map(_node_active, node_nums))
+                if active
+            ]
+        _active_nodes_cache_at = now
+    return _active_nodes_cache
 
 def get_vnc_host():
     """Get the hostname to use for VNC URLs."""
@@ -37,7 +124,6 @@ def get_vnc_host():
         if not _vnc_host:
             # Try to detect from request context, fallback to localhost
             try:
-                from flask import request
                 _vnc_host = request.host.split(':')[0]
             except:
                 _vnc_host = 'localhost'
@@ -48,7 +134,7 @@ def get_docker_network():
     global _docker_network
     if _docker_network is None:
         try:
-            client = docker.from_env()
+            client = docker_client()
             # Get the gui container itself
             gui_container = client.containers.get('gui')
             # Get the first network it's connected to
@@ -69,20 +155,16 @@ def get_scraper_image():
     global _scraper_image
     if _scraper_image is None:
         try:
-            client = docker.from_env()
-            # Look for any image with 'scraper' in the name
-            images = client.images.list()
-            for image in images:
-                if image.tags:
-                    for tag in image.tags:
-                        if 'scraper' in tag.lower():
-                            _scraper_image = tag
-                            app.logger.info(f"Auto-detected scraper image: {_scraper_image}")
-                            break
-                if _scraper_image:
-                    break
-
-            if not _scraper_image:
+            client = docker_client()
+            # Look for any image with 'scraper' in the name; the generator
+            # stops at the first matching tag instead of scanning them all
+            _scraper_image = next(
+                (tag for image in client.images.list()
+                 for tag in (image.tags or []) if 'scraper' in tag.lower()),
+                None)
+            if _scraper_image:
+                app.logger.info(f"Auto-detected scraper image: {_scraper_image}")
+            else:
                 # Fallback to hardcoded name
                 _scraper_image = "youtubestats-scraper-tech-enthusiast:latest"
                 app.logger.warning(f"Could not detect scraper image, using fallback: {_scraper_image}")
@@ -91,34 +173,101 @@ def get_scraper_image():
             _scraper_image = "youtubestats-scraper-tech-enthusiast:latest"  # Fallback
     return _scraper_image
 
+# Settings change only through update_settings, so cache the parsed file
+# keyed on its mtime instead of re-reading and re-parsing it per request
+_settings_cache = None
+_settings_mtime = 0
+
 def load_settings():
     """Load settings from file, or return defaults if file doesn't exist."""
+    global _settings_cache, _settings_mtime
     try:
         if os.path.exists(SETTINGS_FILE):
+            mtime = os.stat(SETTINGS_FILE).st_mtime_ns
+            if _settings_cache is not None and mtime == _settings_mtime:
+                return _settings_cache.copy()
             with open(SETTINGS_FILE, 'r') as f:
-                return json.load(f)
+                settings = json.load(f)
+            _settings_cache = settings
+            _settings_mtime = mtime
+            return settings.copy()
     except Exception as e:
         app.logger.error(f"Error loading settings: {e}")
     return DEFAULT_SETTINGS.copy()
 
 def save_settings(settings):
     """Save settings to file."""
+    global _settings_cache, _settings_mtime
     try:
         with open(SETTINGS_FILE, 'w') as f:
             json.dump(settings, f, indent=2)
+        # Refresh the cache directly so the next load skips the re-read
+        _settings_cache = settings.copy()
+        _settings_mtime = os.stat(SETTINGS_FILE).st_mtime_ns
         return True
     except Exception as e:
         app.logger.error(f"Error saving settings: {e}")
         return False
 
-# Database connection
-def get_db_connection():
-    conn = psycopg2.connect(
-        host="db",
-        database=os.environ.get("POSTGRES_DB"),
-        user=os.environ.get("POSTGRES_USER"),
-        password=os.environ.get("POSTGRES_PASSWORD"))
-    return conn
+# Database connection pool, shared by all requests. Created lazily so the app
+# can start even while the database container is still coming up.
+_db_pool = None
+
+def _configure_connection(conn):
+    # prepare_threshold=0 turns every parameterized query into a server-side
+    # prepared statement on first use, so the near-identical SELECTs issued by
+    # status polling skip parse/plan on every subsequent execution.
+    conn.prepare_threshold = 0
+
+def _get_db_pool():
+    global _db_pool
+    if _db_pool is None:
+        _db_pool = ConnectionPool(
+            psycopg.conninfo.make_conninfo(
+                host="db",
+                dbname=os.environ.get("POSTGRES_DB"),
+                user=os.environ.get("POSTGRES_USER"),
+                password=os.environ.get("POSTGRES_PASSWORD")),
+            min_size=2, max_size=20,
+            configure=_configure_connection)
+    return _db_pool
+
+@contextmanager
+def db_conn():
+    """Check a connection out of the pool and always return it on exit."""
+    with _get_db_pool().connection() as conn:
+        yield conn
+
+def bulk_insert(cur, sql, rows):
+    """
+    Insert many rows in one batch.
+
+    psycopg 3's executemany pipelines the whole batch over a single
+    round-trip, so any bulk import (profiles, contexts, ...) should go
+    through this rather than calling execute() in a Python loop.
+    """
+    cur.executemany(sql, rows)
+
+# Profile and context names are tiny, rarely-changing lookup tables that get
+# re-read on every experiment start. Memoize them per id; the add endpoints
+# clear the caches after inserting so fresh rows are picked up immediately.
+@lru_cache(maxsize=512)
+def _profile_name(profile_id):
+    with db_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT profile_name FROM profiles WHERE profile_id = %s", (profile_id,))
+        row = cur.fetchone()
+        cur.close()
+    return row[0] if row else None
+
+@lru_cache(maxsize=512)
+def _context_name(context_id):
+    with db_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT context_name FROM experiment_contexts WHERE context_id = %s", (context_id,))
+        row = cur.fetchone()
+        cur.close()
+    return row[0] if row else None
 
 @app.route('/')
 def index():
@@ -126,24 +275,24 @@ def index():
 
 @app.route('/api/profiles')
 def get_profiles():
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT profile_id, profile_name FROM profiles ORDER BY profile_name")
-    profiles = cur.fetchall()
-    cur.close()
-    conn.close()
-    return jsonify([{"id": p[0], "name": p[1]} for p in profiles])
+    with db_conn() as conn:
+        # dict_row builds the response rows during fetch; the column aliases
+        # give them their final JSON shape with no per-row Python pass
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute("SELECT profile_id AS id, profile_name AS name FROM profiles ORDER BY profile_name")
+        profiles = cur.fetchall()
+        cur.close()
+    return jsonify(profiles)
 
 @app.route('/api/contexts')
 def get_contexts():
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT context_id, context_name FROM experiment_contexts ORDER BY context_name")
-    contexts = cur.fetchall()
-    app.logger.info(f"Contexts from DB: {contexts}")
-    cur.close()
-    conn.close()
-    return jsonify([{"id": c[0], "name": c[1]} for c in contexts])
+    with db_conn() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute("SELECT context_id AS id, context_name AS name FROM experiment_contexts ORDER BY context_name")
+        contexts = cur.fetchall()
+        app.logger.info(f"Contexts from DB: {contexts}")
+        cur.close()
+    return jsonify(contexts)
 
 @app.route('/api/start-experiment', methods=['POST'])
 def start_experiment():
@@ -154,36 +303,22 @@ def start_experiment():
     max_depth = data.get('max_depth')
     concurrent_users = data.get('concurrent_users', 1)
 
-    # Get profile names for better naming
-    profile_names = []
+    # Get profile names for better naming: one ANY() query for the whole list
+    # instead of a round-trip per profile id
     if profile_ids:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        for profile_id in profile_ids:
-            cur.execute("SELECT profile_name FROM profiles WHERE profile_id = %s", (profile_id,))
-            result = cur.fetchone()
-            if result:
-                profile_names.append(result[0].replace(' ', '-').lower())
-        cur.close()
-        conn.close()
+        lookup_ids = list(profile_ids)
     elif experiment_mode == 'sequential_persona':
         # For sequential mode, extract profile IDs from persona_sequence
-        persona_sequence = data.get('persona_sequence', [])
-        if persona_sequence:
-            conn = get_db_connection()
-            cur = conn.cursor()
-            for seq_item in persona_sequence:
-                profile_id = seq_item.get('profile_id')
-                if profile_id:
-                    cur.execute("SELECT profile_name FROM profiles WHERE profile_id = %s", (profile_id,))
-                    result = cur.fetchone()
-                    if result:
-                        profile_names.append(result[0].replace(' ', '-').lower())
-            cur.close()
-            conn.close()
+        lookup_ids = [seq_item.get('profile_id')
+                      for seq_item in data.get('persona_sequence', [])
+                      if seq_item.get('profile_id')]
+    else:
+        lookup_ids = []
+
+    profile_names = [name.replace(' ', '-').lower()
+                     for name in map(_profile_name, lookup_ids) if name]
 
     # Generate a descriptive experiment name
-    from datetime import datetime
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     if profile_names:
         profile_part = '-'.join(profile_names[:2])  # Use first 2 profiles max
@@ -249,20 +384,17 @@ def start_experiment():
     elif experiment_mode == 'mixed_persona':
         weights = data.get('weights')
 
-        # Normalize weights to sum to 1.0
-        weight_values = [float(w) for w in weights.values()]
-        total_weight = sum(weight_values)
-
-        if total_weight == 0:
-            # If all weights are 0, distribute equally
-            normalized_weights = {pid: 1.0 / len(weights) for pid in weights.keys()}
-        else:
-            # Normalize so they sum to 1.0
-            normalized_weights = {pid: float(w) / total_weight for pid, w in weights.items()}
-
-        config['experiment']['persona_mix'] = []
-        for profile_id, weight in normalized_weights.items():
-            config['experiment']['persona_mix'].append({'profile_id': int(profile_id), 'weight': weight})
+        # Normalize weights to sum to 1.0: one conversion pass, one output
+        # pass, with an equal split when all weights are 0
+        weight_values = {pid: float(w) for pid, w in weights.items()}
+        total_weight = sum(weight_values.values())
+        equal_share = 1.0 / len(weight_values) if weight_values else 0.0
+
+        config['experiment']['persona_mix'] = [
+            {'profile_id': int(pid),
+             'weight': w / total_weight if total_weight else equal_share}
+            for pid, w in weight_values.items()
+        ]
     elif experiment_mode == 'sequential_persona':
         persona_sequence = data.get('persona_sequence')
         if not persona_sequence:
@@ -270,21 +402,17 @@ def start_experiment():
         config['experiment']['persona_sequence'] = persona_sequence
     
     if context_id:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT context_name FROM experiment_contexts WHERE context_id = %s", (context_id,))
-        context_name = cur.fetchone()[0]
-        cur.close()
-        conn.close()
-        config['experiment']['context_name'] = context_name
+        config['experiment']['context_name'] = _context_name(context_id)
 
-    # Use container paths
-    config_file_path = f"/app/configs/{experiment_name}.yaml"
-    with open(config_file_path, 'w') as f:
-        yaml.dump(config, f)
+    # Hand the config to the scraper inline instead of writing a YAML file
+    # under /app/configs and bind-mounting it: no disk write on the start
+    # path, no bind-mount setup, and no stale config files accumulating
+    config_b64 = base64.b64encode(
+        yaml.dump(config, Dumper=YamlDumper, default_flow_style=False, sort_keys=False).encode()
+    ).decode()
 
     # Use Docker SDK to create and start the container directly
-    client = docker.from_env()
+    client = docker_client()
 
     # Auto-detect scraper image
     image_name = get_scraper_image()
@@ -303,18 +431,15 @@ def start_experiment():
         'OPENROUTER_API_KEY': os.environ.get('OPENROUTER_API_KEY', ''),
         'SELENIUM_HUB_URL': 'http://selenium_hub:4444',
         'BROWSER_TYPE': os.environ.get('BROWSER_TYPE', ''),
-        'CONFIG_FILE': '/app/experiment.yaml'
+        'CONFIG_B64': config_b64
     }
 
-    # Create and start the container
-    # Use absolute path from host perspective - get from environment variable
-    host_base_path = os.environ.get('HOST_PROJECT_PATH', os.getcwd())
-    host_config_path = os.path.join(host_base_path, 'configs', f"{experiment_name}.yaml")
-
-    # Prepare labels for container metadata
+    # Prepare labels for container metadata. Only the profile ids are stored;
+    # names are resolved at read time so renames in the DB stay visible and
+    # long persona lists can't overflow the label value
     labels = {
         'experiment.mode': experiment_mode,
-        'experiment.profiles': ', '.join([name.replace('-', ' ').title() for name in profile_names]) if profile_names else 'Random',
+        'experiment.profile_ids': ','.join(map(str, lookup_ids)),
         'experiment.max_depth': str(max_depth),
         'experiment.concurrent_users': str(concurrent_users)
     }
@@ -325,174 +450,206 @@ def start_experiment():
         detach=True,
         environment=env_vars,
         labels=labels,
-        volumes={
-            host_config_path: {
-                'bind': '/app/experiment.yaml',
-                'mode': 'ro'
-            }
-        },
         network=get_docker_network()
     )
+    invalidate_container_cache()
 
     return jsonify({"message": f"Experiment '{experiment_name}' started successfully!"})
 
 @app.route('/api/status')
 def get_status():
-    client = docker.from_env()
-    containers = client.containers.list(all=True)  # Include stopped containers
+    containers = list_containers()  # Include stopped containers
+    scraper_containers = [c for c in containers if c.name.startswith('scraper-')]
     experiments = []
+    # Resolve once per request instead of inside the per-user loop (and while
+    # the request context needed for the Host-header fallback is available)
+    vnc_host = get_vnc_host()
+
+    container_sessions = {}
+    session_metrics = {}
+
+    with db_conn() as conn:
+        cur = conn.cursor()
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+        # Resolve the sessions belonging to each container first, so the
+        # progress metrics below can be fetched for all of them at once.
+        # One UNNEST join covers every container's creation-time window in a
+        # single round-trip instead of one query per container.
+        session_lookup = [
+            (container.name, container.attrs['Created'],
+             int(container.labels.get('experiment.concurrent_users', 1)))
+            for container in scraper_containers
+            if int(container.labels.get('experiment.max_depth', 0)) > 0
+        ]
+        if session_lookup:
+            try:
+                cur.execute("""
+                    SELECT c.name, s.session_id
+                    FROM unnest(%s::text[], %s::timestamptz[]) AS c(name, created)
+                    JOIN sessions s
+                      ON s.start_time >= c.created - INTERVAL '30 seconds'
+                     AND s.start_time <= c.created + INTERVAL '60 seconds'
+                    ORDER BY c.name, s.start_time ASC
+                """, ([name for name, _, _ in session_lookup],
+                      [created for _, created, _ in session_lookup]))
+                for name, session_id in cur.fetchall():
+                    container_sessions.setdefault(name, []).append(session_id)
+                # Every looked-up container gets an entry, trimmed to its user count
+                for name, _, concurrent_users in session_lookup:
+                    container_sessions[name] = container_sessions.get(name, [])[:concurrent_users]
+            except Exception as e:
+                app.logger.warning(f"Could not look up container sessions: {e}")
+                conn.rollback()
+
+        # One statement for every session across all containers instead of
+        # three SELECTs per session: a GROUP BY CTE for the context/persona
+        # counts joined with a DISTINCT ON CTE for the most recent phase.
+        all_session_ids = [sid for sids in container_sessions.values() for sid in sids]
+        if all_session_ids:
+            try:
+                cur.execute("""
+                    WITH counts AS (
+                        SELECT session_id,
+                               COUNT(DISTINCT source_video_id) FILTER (WHERE was_during_context) AS context_count,
+                               COUNT(*) FILTER (WHERE was_selected AND NOT was_during_context) AS persona_count
+                        FROM recommendation_log
+                        WHERE session_id = ANY(%s)
+                        GROUP BY session_id
+                    ), last_step AS (
+                        SELECT DISTINCT ON (session_id) session_id, was_during_context
+                        FROM recommendation_log
+                        WHERE session_id = ANY(%s)
+                        ORDER BY session_id, depth DESC
+                    )
+                    SELECT session_id, context_count, persona_count, was_during_context
+                    FROM counts JOIN last_step USING (session_id)
+                """, (all_session_ids, all_session_ids), binary=True)
+                for session_id, context_count, persona_count, was_during_context in cur.fetchall():
+                    session_metrics[session_id] = {
+                        'context_count': context_count,
+                        'persona_count': persona_count,
+                        'is_context': was_during_context
+                    }
+            except Exception as e:
+                app.logger.warning(f"Could not calculate progress: {e}")
+                conn.rollback()
+                session_metrics = {}
 
-    for container in containers:
-        if container.name.startswith('scraper-'):
-            # Get experiment name from container
-            experiment_name = container.name.replace('scraper-', '')
+        cur.close()
 
-            # Get labels from container
-            labels = container.labels
+    def build_container_entry(container):
+        """Assemble the status entries for one container (runs on a pool thread)."""
+        entries = []
+
+        # Get experiment name from container
+        experiment_name = container.name.replace('scraper-', '')
+
+        # Get labels from container; profile names come from the memoized
+        # lookup, so repeat polls resolve them without a round-trip
+        labels = container.labels
+        profile_ids_label = labels.get('experiment.profile_ids')
+        if profile_ids_label is not None:
+            ids = [int(pid) for pid in profile_ids_label.split(',') if pid]
+            names = [name for name in map(_profile_name, ids) if name]
+            profiles = ', '.join(names) if names else 'Random'
+        else:
+            # Containers started before ids were labelled carry the
+            # pre-joined name string
             profiles = labels.get('experiment.profiles', 'N/A')
-            max_depth = int(labels.get('experiment.max_depth', 0))
-            concurrent_users = int(labels.get('experiment.concurrent_users', 1))
-
-            if max_depth > 0:
-                try:
-                    # Get ALL sessions for this specific container
-                    container_created = container.attrs['Created']
-
-                    cur.execute("""
-                        SELECT session_id FROM sessions
-                        WHERE start_time >= (TIMESTAMP %s - INTERVAL '30 seconds')
-                          AND start_time <= (TIMESTAMP %s + INTERVAL '60 seconds')
-                        ORDER BY start_time ASC
-                    """, (container_created, container_created))
-
-                    sessions = cur.fetchall()
-                    session_ids = [s[0] for s in sessions[:concurrent_users]]
-
-                    # Get active Selenium nodes for this container
-                    active_nodes = []
-                    if container.status == 'running':
-                        try:
-                            for node_num in range(1, 12):
-                                try:
-                                    node_container = client.containers.get(f'selenium_node_{node_num}')
-                                    result = node_container.exec_run(
-                                        'sh -c "ps aux | grep -i chromium | grep -v grep | grep -v java"',
-                                        demux=False
-                                    )
-                                    if result.exit_code == 0 and result.output and result.output.strip():
-                                        active_nodes.append(node_num)
-                                except Exception:
-                                    continue
-                        except Exception as e:
-                            app.logger.warning(f"Could not detect active browser nodes: {e}")
-
-                    # Create one entry per session/user
-                    for idx, session_id in enumerate(session_ids):
-                        # Count context phase videos
-                        cur.execute("""
-                            SELECT COUNT(DISTINCT source_video_id)
-                            FROM recommendation_log
-                            WHERE session_id = %s AND was_during_context = true
-                        """, (session_id,))
-                        context_count = cur.fetchone()[0]
-
-                        # Count persona phase videos
-                        cur.execute("""
-                            SELECT COUNT(*) FROM recommendation_log
-                            WHERE session_id = %s AND was_selected = true AND was_during_context = false
-                        """, (session_id,))
-                        persona_count = cur.fetchone()[0]
-
-                        # Determine phase for this session
-                        cur.execute("""
-                            SELECT was_during_context FROM recommendation_log
-                            WHERE session_id = %s
-                            ORDER BY depth DESC LIMIT 1
-                        """, (session_id,))
-                        phase_result = cur.fetchone()
-
-                        progress = 0
-                        phase = 'Initializing'
-
-                        if phase_result:
-                            is_context = phase_result[0]
-                            if is_context:
-                                phase = f'Context Phase ({context_count}/10)'
-                            else:
-                                phase = f'Persona Phase ({persona_count}/{max_depth - 10})'
-
-                            # Calculate progress
-                            video_count = context_count + persona_count
-                            progress = min(100, int((video_count / max_depth) * 100))
-
-                        # Assign view URL from active nodes
-                        view_url = None
-                        if idx < len(active_nodes) and container.status == 'running':
-                            vnc_host = get_vnc_host()
-                            view_url = f'http://{vnc_host}:{7900 + active_nodes[idx]}'
-
-                        # Create user-specific name
-                        user_name = f"{experiment_name}"
-                        if concurrent_users > 1:
-                            user_name += f" - User {idx + 1}"
-
-                        experiments.append({
-                            'name': user_name,
-                            'profiles': profiles,
-                            'status': container.status,
-                            'progress': progress,
-                            'phase': phase,
-                            'view_url': view_url,
-                            'concurrent_users': concurrent_users,
-                            'user_id': idx + 1,
-                            'session_id': session_id,
-                            'container_name': container.name
-                        })
-
-                except Exception as e:
-                    app.logger.warning(f"Could not calculate progress: {e}")
-                    conn.rollback()
-
-                    # Fallback: show at least the container as one entry
-                    experiments.append({
-                        'name': experiment_name,
-                        'profiles': profiles,
-                        'status': container.status,
-                        'progress': 0,
-                        'phase': 'Initializing',
-                        'view_url': None,
-                        'concurrent_users': concurrent_users,
-                        'user_id': 1,
-                        'session_id': None,
-                        'container_name': container.name
-                    })
-            else:
-                # No max_depth, just show basic container info
-                experiments.append({
-                    'name': experiment_name,
+        max_depth = int(labels.get('experiment.max_depth', 0))
+        concurrent_users = int(labels.get('experiment.concurrent_users', 1))
+
+        session_ids = container_sessions.get(container.name)
+        if max_depth > 0 and session_ids is not None:
+            # Get active Selenium nodes (shared probe, cached across containers)
+            active_nodes = get_active_nodes() if container.status == 'running' else []
+
+            # Create one entry per session/user
+            for idx, session_id in enumerate(session_ids):
+                metrics = session_metrics.get(session_id)
+
+                progress = 0
+                phase = 'Initializing'
+
+                if metrics:
+                    context_count = metrics['context_count']
+                    persona_count = metrics['persona_count']
+                    if metrics['is_context']:
+                        phase = f'Context Phase ({context_count}/10)'
+                    else:
+                        phase = f'Persona Phase ({persona_count}/{max_depth - 10})'
+
+                    # Calculate progress
+                    video_count = context_count + persona_count
+                    progress = min(100, int((video_count / max_depth) * 100))
+
+                # Assign view URL from active nodes
+                view_url = None
+                if idx < len(active_nodes) and container.status == 'running':
+                    view_url = f'http://{vnc_host}:{7900 + active_nodes[idx]}'
+
+                # Create user-specific name
+                user_name = f"{experiment_name}"
+                if concurrent_users > 1:
+                    user_name += f" - User {idx + 1}"
+
+                entries.append({
+                    'name': user_name,
                     'profiles': profiles,
                     'status': container.status,
-                    'progress': 0,
-                    'phase': 'N/A',
-                    'view_url': None,
+                    'progress': progress,
+                    'phase': phase,
+                    'view_url': view_url,
                     'concurrent_users': concurrent_users,
-                    'user_id': 1,
-                    'session_id': None,
+                    'user_id': idx + 1,
+                    'session_id': session_id,
                     'container_name': container.name
                 })
+        elif max_depth > 0:
+            # Session lookup failed: show at least the container as one entry
+            entries.append({
+                'name': experiment_name,
+                'profiles': profiles,
+                'status': container.status,
+                'progress': 0,
+                'phase': 'Initializing',
+                'view_url': None,
+                'concurrent_users': concurrent_users,
+                'user_id': 1,
+                'session_id': None,
+                'container_name': container.name
+            })
+        else:
+            # No max_depth, just show basic container info
+            entries.append({
+                'name': experiment_name,
+                'profiles': profiles,
+                'status': container.status,
+                'progress': 0,
+                'phase': 'N/A',
+                'view_url': None,
+                'concurrent_users': concurrent_users,
+                'user_id': 1,
+                'session_id': None,
+                'container_name': container.name
+            })
+
+        return entries
+
+    if any(container.status == 'running' for container in scraper_containers):
+        get_active_nodes()  # prime the shared node probe once before fanning out
+
+    # The remaining per-container assembly is independent, so fan it out
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for entries in executor.map(build_container_entry, scraper_containers):
+            experiments.extend(entries)
 
-    cur.close()
-    conn.close()
     return jsonify(experiments)
 
 @app.route('/api/clear-experiments', methods=['POST'])
 def clear_experiments():
     try:
-        client = docker.from_env()
-        containers = client.containers.list(all=True)
+        containers = list_containers()
         removed_count = 0
 
         for container in containers:
@@ -500,6 +657,8 @@ def clear_experiments():
                 container.remove()
                 removed_count += 1
 
+        if removed_count:
+            invalidate_container_cache()
         return jsonify({"message": f"Cleared {removed_count} exited experiment(s)"})
     except Exception as e:
         app.logger.error(f"Error clearing experiments: {e}")
@@ -508,13 +667,14 @@ def clear_experiments():
 @app.route('/api/stop-experiment/<experiment_name>', methods=['POST'])
 def stop_experiment(experiment_name):
     try:
-        client = docker.from_env()
+        client = docker_client()
         container_name = f"scraper-{experiment_name}"
 
         try:
             container = client.containers.get(container_name)
             if container.status == 'running':
                 container.stop(timeout=10)
+                invalidate_container_cache()
                 return jsonify({"message": f"Experiment '{experiment_name}' stopped successfully"})
             else:
                 return jsonify({"message": f"Experiment '{experiment_name}' is not running"}), 400
@@ -531,12 +691,13 @@ def add_profile():
         profile_name = data.get('name')
         persona_description = data.get('description')
 
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("INSERT INTO profiles (profile_name, persona_description) VALUES (%s, %s)", (profile_name, persona_description))
-        conn.commit()
-        cur.close()
-        conn.close()
+        with db_conn() as conn:
+            cur = conn.cursor()
+            bulk_insert(cur, "INSERT INTO profiles (profile_name, persona_description) VALUES (%s, %s)",
+                        [(profile_name, persona_description)])
+            conn.commit()
+            cur.close()
+        _profile_name.cache_clear()
 
         return jsonify({"message": "Persona added successfully!"})
     except Exception as e:
@@ -551,12 +712,13 @@ def add_context():
         description = data.get('description')
         video_ids = [v.strip() for v in data.get('videos').split(',')]
 
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("INSERT INTO experiment_contexts (context_name, description, video_ids) VALUES (%s, %s, %s)", (context_name, description, video_ids))
-        conn.commit()
-        cur.close()
-        conn.close()
+        with db_conn() as conn:
+            cur = conn.cursor()
+            bulk_insert(cur, "INSERT INTO experiment_contexts (context_name, description, video_ids) VALUES (%s, %s, %s)",
+                        [(context_name, description, video_ids)])
+            conn.commit()
+            cur.close()
+        _context_name.cache_clear()
 
         return jsonify({"message": "Context added successfully!"})
     except Exception as e:
@@ -576,41 +738,57 @@ def get_table_data(table_name):
         return jsonify({"error": "Invalid table name"}), 400
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        limit = int(request.args.get('limit', 100))
+    except (TypeError, ValueError):
+        limit = 100
+    limit = max(1, min(limit, 10_000))
+
+    try:
+        with db_conn() as conn:
+            cur = conn.cursor()
 
-        # Get column names
-        cur.execute(f"""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = %s
-            ORDER BY ordinal_position
-        """, (table_name,))
-        columns = [row[0] for row in cur.fetchall()]
-
-        # Get row count
-        cur.execute(f"SELECT COUNT(*) FROM {table_name}")
-        total_rows = cur.fetchone()[0]
-
-        # Get data (last 100 rows, ordered by first column if possible)
-        cur.execute(f"SELECT * FROM {table_name} ORDER BY {columns[0]} DESC LIMIT 100")
-        rows = cur.fetchall()
-
-        # Convert rows to list of dicts
-        data = []
-        for row in rows:
-            row_dict = {}
-            for i, col in enumerate(columns):
-                value = row[i]
-                # Convert special types to strings for JSON serialization
-                if isinstance(value, (dict, list)):
-                    row_dict[col] = str(value)
-                else:
-                    row_dict[col] = value
-            data.append(row_dict)
+            # Get column names
+            cur.execute(f"""
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_name = %s
+                ORDER BY ordinal_position
+            """, (table_name,))
+            columns = [row[0] for row in cur.fetchall()]
+
+            # Get row count: exact for small tables, the planner's reltuples
+            # estimate for large ones, where an exact COUNT(*) means a full scan
+            cur.execute(f"""
+                SELECT CASE WHEN reltuples < 100000
+                            THEN (SELECT COUNT(*) FROM {table_name})
+                            ELSE reltuples::bigint END
+                FROM pg_class WHERE relname = %s
+            """, (table_name,))
+            count_row = cur.fetchone()
+            total_rows = count_row[0] if count_row else 0
+
+            # Get data (last `limit` rows, ordered by first column if possible).
+            # Large limits stream through a server-side cursor instead of
+            # materializing the whole result in the backend's send buffer.
+            data_sql = f"SELECT * FROM {table_name} ORDER BY {columns[0]} DESC LIMIT {limit}"
+            if limit > 500:
+                with conn.cursor(name='tbl_stream', row_factory=dict_row) as stream_cur:
+                    stream_cur.itersize = 500
+                    stream_cur.execute(data_sql)
+                    data = list(stream_cur)
+            else:
+                with conn.cursor(row_factory=dict_row) as dict_cur:
+                    dict_cur.execute(data_sql)
+                    data = dict_cur.fetchall()
 
-        cur.close()
-        conn.close()
+            # dict_row already built the dicts during fetch; one pass converts
+            # the special types (arrays, JSONB) to strings for serialization
+            for row in data:
+                for col, value in row.items():
+                    if isinstance(value, (dict, list)):
+                        row[col] = str(value)
+
+            cur.close()
 
         return jsonify({
             "table": table_name,
@@ -655,7 +833,16 @@ def update_settings():
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    # Warm the docker auto-detection caches before serving so the first
+    # experiment start and status poll don't pay the detection cost.
+    try:
+        get_docker_network()
+        get_scraper_image()
+    except Exception as e:
+        app.logger.warning(f"Could not pre-warm docker caches: {e}")
+    # Threaded WSGI server: slow status polls no longer serialize every
+    # other request the way the single-threaded Werkzeug dev server did
+    serve(app, host='0.0.0.0', port=5001, threads=8)
 
 
 
@@ -1,4 +1,5 @@
 """Browser management for the YouTube scraper."""
+import os
 import time
 import logging
 from selenium import webdriver
@@ -8,10 +9,61 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.common.proxy import Proxy, ProxyType
+from selenium.common.exceptions import TimeoutException
 from config import get_config
 
 logger = logging.getLogger(__name__)
 
+class _ReattachedRemote(webdriver.Remote):
+    """Remote driver that adopts an existing grid session instead of
+    creating a new one."""
+
+    def __init__(self, command_executor, session_id, options):
+        self._existing_session_id = session_id
+        super().__init__(command_executor=command_executor, options=options)
+
+    def start_session(self, *args, **kwargs):
+        # Skip the newSession command entirely and talk to the saved session
+        self.caps = {}
+        self.session_id = self._existing_session_id
+
+
+def _remote_driver(hub_url, browser_options):
+    """Connects to the Selenium grid, reusing a saved session when enabled.
+
+    When SELENIUM_SESSION_FILE is set, the grid session id is persisted
+    there and later invocations reattach to the still-running browser,
+    skipping Chromium cold-start and consent handling (10s+ per run).
+
+    Opt-in and debug-oriented only: a reused browser keeps cookies and
+    watch history from earlier runs, which contaminates the
+    recommendation state the experiments measure. Leave the variable
+    unset for real data collection.
+    """
+    session_file = os.getenv('SELENIUM_SESSION_FILE')
+
+    if session_file and os.path.exists(session_file):
+        try:
+            with open(session_file) as f:
+                session_id = f.read().strip()
+            if session_id:
+                driver = _ReattachedRemote(hub_url, session_id, browser_options)
+                driver.current_url  # Probe: raises if the session is gone
+                logger.info(f"Reattached to existing browser session {session_id}")
+                return driver
+        except Exception as e:
+            logger.warning(f"Could not reattach to saved session, starting fresh: {e}")
+
+    driver = webdriver.Remote(command_executor=hub_url, options=browser_options)
+    if session_file:
+        try:
+            with open(session_file, 'w') as f:
+                f.write(driver.session_id)
+        except OSError as e:
+            logger.warning(f"Could not persist session id to {session_file}: {e}")
+    return driver
+
+
 def setup_browser(proxy=None):
     """Sets up and returns a configured browser driver."""
     config = get_config()
@@ -26,6 +78,25 @@ def setup_browser(proxy=None):
     else:
         raise ValueError(f"Unsupported browser_type: {browser_type}. Choose 'chrome' or 'firefox'.")
 
+    # Return from driver.get as soon as the DOM is interactive instead of
+    # waiting for every subresource; the explicit waits below cover the rest
+    browser_options.page_load_strategy = 'eager'
+
+    # Thumbnails and webfonts are pure bandwidth for a bot that reads the
+    # DOM: don't download them. Video/media playback stays enabled — the
+    # whole point of the scraper is to actually watch videos.
+    if browser_type == "chrome":
+        browser_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+        # Container hygiene: no GPU in the scraper containers, and /dev/shm
+        # is too small there for Chrome's default shared-memory usage
+        browser_options.add_argument('--disable-gpu')
+        browser_options.add_argument('--disable-dev-shm-usage')
+    else:  # Firefox
+        browser_options.set_preference("permissions.default.image", 2)
+        browser_options.set_preference("gfx.downloadable_fonts.enabled", False)
+
     if proxy:
         logger.info(f"Using proxy: {proxy}")
         if browser_type == "firefox":
@@ -41,10 +112,7 @@ def setup_browser(proxy=None):
     selenium_hub_url = config.selenium.hub_url
     if selenium_hub_url:
         logger.info(f"Connecting to Selenium Hub at {selenium_hub_url}")
-        driver = webdriver.Remote(
-            command_executor=selenium_hub_url,
-            options=browser_options
-        )
+        driver = _remote_driver(selenium_hub_url, browser_options)
     else:
         logger.info(f"Connecting to local {browser_type.capitalize()} driver")
         if browser_type == "firefox":
@@ -52,18 +120,54 @@ def setup_browser(proxy=None):
         else:  # Default to Chrome for local
             driver = webdriver.Chrome(options=browser_options)
 
+    # Pattern-level request blocking over CDP (local Chrome only): the image
+    # pref above doesn't stop webfonts, and setBlockedURLs kills the requests
+    # before they leave the browser. Video/media streams are deliberately not
+    # on the list - the bot has to actually play videos.
+    if hasattr(driver, 'execute_cdp_cmd'):
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": [
+                "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif",
+                "*.woff", "*.woff2", "*.ttf", "*.otf",
+            ]})
+        except Exception as e:
+            logger.debug(f"CDP request blocking unavailable: {e}")
+
     return driver
 
 
+def inject_consent_cookies(driver):
+    """Pre-seeds YouTube's consent cookies so the dialog never renders.
+
+    Clicking through the consent overlay costs a page render plus waits on
+    every fresh browser session. Setting the SOCS/CONSENT cookies before the
+    first real navigation makes YouTube treat consent as already given.
+    add_cookie requires being on the target domain, so a cheap non-rendering
+    page (robots.txt) is loaded first.
+    """
+    try:
+        logger.info("Injecting consent cookies before first navigation...")
+        driver.get("https://www.youtube.com/robots.txt")
+        driver.add_cookie({'name': 'SOCS', 'value': 'CAISAiAD', 'domain': '.youtube.com'})
+        driver.add_cookie({'name': 'CONSENT', 'value': 'YES+cb', 'domain': '.youtube.com'})
+    except Exception as e:
+        logger.warning(f"Could not inject consent cookies, will rely on the dialog fallback: {e}")
+
+
 def accept_cookies(driver):
-    """Accepts YouTube cookies if the consent dialog appears."""
+    """Accepts YouTube cookies if the consent dialog appears.
+
+    With inject_consent_cookies in place this is only a fallback, so the
+    wait is short: when the cookies worked there is no dialog to find.
+    """
     try:
         logger.info("Checking for and clicking the cookie consent button...")
         # This XPath targets the "Accept all" button in the consent dialog.
         cookie_button_xpath = "//*[@id='content']/div[2]/div[6]/div[1]/ytd-button-renderer[2]/yt-button-shape/button"
 
-        # Wait up to 10 seconds for the button to be clickable, then click it.
-        accept_button = WebDriverWait(driver, 10).until(
+        # Wait briefly for the button to be clickable, then click it.
+        accept_button = WebDriverWait(driver, 3).until(
             EC.element_to_be_clickable((By.XPATH, cookie_button_xpath))
         )
         accept_button.click()
@@ -85,26 +189,128 @@ def scroll_to_load_recommendations(driver):
 
         # Scroll the container into view to start
         driver.execute_script("arguments[0].scrollIntoView(true);", related_container)
-        time.sleep(2)  # Wait for initial content to load after scrolling
 
-        # Perform a few more incremental scrolls to be sure
-        for _ in range(3):
-            driver.execute_script("window.scrollBy(0, 200);")  # Scroll down 200 pixels
-            time.sleep(2)  # Pause to allow content to render
+        # Wait for the tiles to actually appear instead of sleeping a fixed
+        # 8 seconds: poll for 20 loaded tiles, nudging the page down between
+        # short waits to trigger further lazy loading
+        def enough_tiles(d):
+            return len(d.find_elements(
+                By.CSS_SELECTOR, "yt-lockup-view-model, ytd-compact-video-renderer")) >= 20
+
+        for _ in range(4):
+            try:
+                WebDriverWait(driver, 2).until(enough_tiles)
+                break
+            except TimeoutException:
+                driver.execute_script("window.scrollBy(0, 400);")
 
         logger.info("Scrolling complete.")
     except Exception as e:
         logger.error(f"Could not scroll to find recommendations: {e}")
 
 
+def get_recommendations_data(driver):
+    """
+    Extracts the recommendation tiles' scalar fields (title, publisher, views,
+    link, duration) in a single execute_script round trip.
+
+    One JS call walks up to 20 tiles in-page and returns a list of small
+    dicts, so no HTML ever crosses the wire and no LLM or BeautifulSoup pass
+    is needed to recover the fields.
+    """
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.ID, "related"))
+    )
+
+    js_extractor_script = """
+        const pick = (root, selectors) => {
+            for (const s of selectors) {
+                const el = root.querySelector(s);
+                if (el) return el;
+            }
+            return null;
+        };
+        const text = (root, selectors) => {
+            const el = pick(root, selectors);
+            return el ? el.textContent.trim() : null;
+        };
+
+        const results = [];
+        const blocks = document.querySelectorAll('yt-lockup-view-model, ytd-compact-video-renderer');
+        for (const block of blocks) {
+            if (results.length >= 20) break;
+
+            const linkEl = pick(block, [
+                'h3.yt-lockup-metadata-view-model__heading-reset a',
+                'h3.yt-lockup-metadata-view-model-wiz__heading-reset a',
+                'a#video-title-link',
+                'a#thumbnail'
+            ]);
+
+            let viewsText = null;
+            const metaEls = block.querySelectorAll(
+                'span.yt-content-metadata-view-model__metadata-text, ' +
+                '.yt-content-metadata-view-model-wiz__metadata-text, ' +
+                'span.ytd-video-meta-block');
+            for (const el of metaEls) {
+                const t = el.textContent;
+                if (t.includes('views') || t.includes('vues')) {
+                    viewsText = t.trim();
+                    break;
+                }
+            }
+
+            results.push({
+                href: linkEl ? linkEl.getAttribute('href') : null,
+                title: text(block, [
+                    'h3.yt-lockup-metadata-view-model__heading-reset a span',
+                    'h3.yt-lockup-metadata-view-model-wiz__heading-reset a span',
+                    'span#video-title'
+                ]),
+                publisher: text(block, [
+                    'span.yt-content-metadata-view-model__metadata-text',
+                    '.yt-content-metadata-view-model-wiz__metadata-text',
+                    '#text > a'
+                ]),
+                views: viewsText,
+                duration: text(block, [
+                    'div.yt-badge-shape__text',
+                    '.yt-lockup-thumbnail-view-model__time-text',
+                    'span.ytd-thumbnail-overlay-time-status-renderer',
+                    '.badge-shape-wiz__text'
+                ])
+            });
+        }
+        return results;
+        """
+
+    # When the driver exposes CDP (local Chrome), evaluate the script over
+    # the devtools channel with returnByValue: the payload comes back as one
+    # serialized value without the WebDriver execute/sync machinery. Remote
+    # grid sessions and Firefox take the regular execute_script path.
+    if hasattr(driver, 'execute_cdp_cmd'):
+        try:
+            result = driver.execute_cdp_cmd('Runtime.evaluate', {
+                'expression': '(() => {' + js_extractor_script + '})()',
+                'returnByValue': True,
+            })
+            return result.get('result', {}).get('value') or []
+        except Exception as e:
+            logger.debug(f"CDP evaluation unavailable, using execute_script: {e}")
+
+    return driver.execute_script(js_extractor_script)
+
+
 def get_recommendations_html(driver):
     """Gets the recommended videos from the related videos section and cleans them."""
     WebDriverWait(driver, 10).until(
         EC.presence_of_element_located((By.ID, "related"))
     )
 
+    # One round trip: the loop over the tiles runs in-page and the cleaned
+    # HTML strings come back as a single array, instead of one execute_script
+    # (and its ~50-100ms WebDriver round trip) per tile.
     js_cleaner_script = """
-        const block = arguments[0];
         const selectorsToRemove = [
             '.yt-lockup-metadata-view-model-wiz__menu-button',
             'ytd-menu-renderer',
@@ -114,26 +320,29 @@ def get_recommendations_html(driver):
             '.yt-core-image' // Only remove the image, not the whole thumbnail
         ];
 
-        // Remove all elements matching the selectors
-        selectorsToRemove.forEach(selector => {
-            block.querySelectorAll(selector).forEach(el => el.remove());
-        });
+        const blocks = document.querySelectorAll('yt-lockup-view-model, ytd-compact-video-renderer');
+        const cleaned = [];
+        for (const block of blocks) {
+            if (cleaned.length >= 20) break;
 
-        // Remove all HTML comment nodes
-        const iterator = document.createNodeIterator(block, NodeFilter.SHOW_COMMENT);
-        let node;
-        while (node = iterator.nextNode()) {
-            node.remove();
-        }
+            // Remove all elements matching the selectors
+            selectorsToRemove.forEach(selector => {
+                block.querySelectorAll(selector).forEach(el => el.remove());
+            });
 
-        return block.innerHTML;
-        """
+            // Remove all HTML comment nodes
+            const iterator = document.createNodeIterator(block, NodeFilter.SHOW_COMMENT);
+            let node;
+            while (node = iterator.nextNode()) {
+                node.remove();
+            }
 
-    recommendation_blocks = driver.find_elements(By.CSS_SELECTOR, "yt-lockup-view-model, ytd-compact-video-renderer")
-    
-    cleaned_html_list = []
-    for block in recommendation_blocks[:20]:
-        cleaned_html = driver.execute_script(js_cleaner_script, block)
-        cleaned_html_list.append(cleaned_html.strip())
+            // Collapse runs of whitespace: YouTube's markup is heavily
+            // indented and the blanks are pure payload (and LLM tokens,
+            // when the LLM fallback parser consumes these blocks)
+            cleaned.push(block.innerHTML.replace(/\\s+/g, ' ').trim());
+        }
+        return cleaned;
+        """
 
-    return cleaned_html_list
\ No newline at end of file
+    return driver.execute_script(js_cleaner_script)
\ No newline at end of file
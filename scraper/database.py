@@ -1,10 +1,13 @@
 """Database operations for the YouTube scraper."""
+import io
 import time
 import logging
+import threading
+from queue import Queue
 from contextlib import contextmanager
 from typing import Optional, Tuple, List, Any
 from dataclasses import dataclass
-import json
+import orjson
 
 try:
     import psycopg2
@@ -20,6 +23,7 @@ logger = logging.getLogger(__name__)
 
 # Connection pool for better resource management
 _connection_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
 
 class DatabaseError(Exception):
     """Custom exception for database operations."""
@@ -34,16 +38,29 @@ class ContextNotFoundError(DatabaseError):
     """Exception raised when a context is not found."""
     pass
 
-def initialize_connection_pool(minconn: int = 1, maxconn: int = 10) -> None:
-    """Initialize the database connection pool."""
+def initialize_connection_pool(minconn: Optional[int] = None, maxconn: Optional[int] = None) -> None:
+    """Initialize the database connection pool.
+
+    By default the pool is sized to the experiment's concurrency (two
+    connections per configured concurrent user, at least two) and fully
+    pre-opened (minconn == maxconn), so no connection is established lazily
+    in the middle of a scraping step.
+    """
     global _connection_pool
-    if _connection_pool is None:
+    with _pool_lock:
+        if _connection_pool is not None:
+            return
         try:
             config = get_config()
+            if maxconn is None:
+                concurrent_users = getattr(config.experiment, 'concurrent_users', 1) or 1
+                maxconn = max(2, 2 * concurrent_users)
+            if minconn is None:
+                minconn = maxconn
             _connection_pool = psycopg2.pool.ThreadedConnectionPool(
                 minconn, maxconn, config.database.url
             )
-            logger.info("Database connection pool initialized")
+            logger.info(f"Database connection pool initialized ({minconn}-{maxconn} connections)")
         except psycopg2.Error as e:
             logger.error(f"Failed to initialize connection pool: {e}")
             raise DatabaseError(f"Failed to initialize connection pool: {e}")
@@ -52,10 +69,45 @@ def initialize_connection_pool(minconn: int = 1, maxconn: int = 10) -> None:
 def close_connection_pool() -> None:
     """Close all connections in the pool."""
     global _connection_pool
-    if _connection_pool:
-        _connection_pool.closeall()
-        _connection_pool = None
-        logger.info("Database connection pool closed")
+    with _pool_lock:
+        if _connection_pool:
+            _connection_pool.closeall()
+            _connection_pool = None
+            logger.info("Database connection pool closed")
+
+
+# The per-step hot queries are PREPAREd once per pooled connection, so every
+# later EXECUTE skips the parse/plan work the server otherwise redoes on each
+# call. Prepared statements are session-scoped; the flag rides on the psycopg2
+# connection object, which maps 1:1 to a server session.
+_PREPARED_STATEMENTS = (
+    "PREPARE q_profile_data (smallint) AS "
+    "SELECT persona_description FROM profiles WHERE profile_id = $1;",
+
+    "PREPARE q_video_duration (text) AS "
+    "SELECT duration_seconds FROM videos WHERE video_youtube_id = $1;",
+
+    "PREPARE q_log_persona_filter (uuid, text, boolean, text, text) AS "
+    "INSERT INTO persona_filter_logs "
+    "(session_id, video_id, was_filtered, filter_justification, video_transcript) "
+    "VALUES ($1, $2, $3, $4, $5);",
+
+    "PREPARE q_update_session_status (text, uuid) AS "
+    "UPDATE sessions SET status = $1, end_time = NOW() WHERE session_id = $2;",
+)
+
+
+def _ensure_prepared(conn) -> None:
+    if getattr(conn, '_trace_prepared', False):
+        return
+    with conn.cursor() as cur:
+        for statement in _PREPARED_STATEMENTS:
+            cur.execute(statement)
+    if not conn.autocommit:
+        # PREPARE is transactional: commit now so a later rollback in the
+        # caller cannot silently deallocate the statements
+        conn.commit()
+    conn._trace_prepared = True
 
 
 @contextmanager
@@ -63,11 +115,16 @@ def get_db_connection():
     """Context manager for database connections with automatic cleanup."""
     if _connection_pool is None:
         initialize_connection_pool()
-    
+
     conn = None
     try:
         conn = _connection_pool.getconn()
+        if conn.closed:
+            # The server may have dropped an idle pooled connection; recycle it
+            _connection_pool.putconn(conn, close=True)
+            conn = _connection_pool.getconn()
         conn.autocommit = False  # Explicit transaction control
+        _ensure_prepared(conn)
         yield conn
     except psycopg2.Error as e:
         if conn:
@@ -84,6 +141,34 @@ def get_db_connection():
             _connection_pool.putconn(conn)
 
 
+@contextmanager
+def get_db_readonly():
+    """Context manager for read-only queries.
+
+    Runs in autocommit mode, so single SELECTs skip the BEGIN/COMMIT round
+    trips that the transactional context manager pays.
+    """
+    if _connection_pool is None:
+        initialize_connection_pool()
+
+    conn = None
+    try:
+        conn = _connection_pool.getconn()
+        if conn.closed:
+            _connection_pool.putconn(conn, close=True)
+            conn = _connection_pool.getconn()
+        conn.autocommit = True
+        _ensure_prepared(conn)
+        yield conn
+    except psycopg2.Error as e:
+        logger.error(f"Database error: {e}")
+        raise DatabaseError(f"Database operation failed: {e}")
+    finally:
+        if conn:
+            conn.autocommit = False
+            _connection_pool.putconn(conn)
+
+
 def create_session(experiment_config: dict) -> int:
     """Creates a new session in the database and returns the session ID."""
     query = """
@@ -92,32 +177,42 @@ def create_session(experiment_config: dict) -> int:
             """
 
     with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        with conn.cursor() as cur:
             # Convert the dict to a JSON string for PostgreSQL's JSONB type
-            cur.execute(query, {'experiment_config': json.dumps(experiment_config)})
+            cur.execute(query, {'experiment_config': orjson.dumps(experiment_config).decode()})
             result = cur.fetchone()
             if not result:
                 raise DatabaseError("Failed to create session")
-            session_id = result['session_id']
+            session_id = result[0]
             conn.commit()
             logger.info(f"Created session {session_id} with experiment config.")
             return session_id
 
 
+# Process-local lookup caches. Durations are effectively immutable once
+# known (the enrichment worker writes them once), so they never expire;
+# profile descriptions can be edited in the GUI, so they get a TTL.
+_duration_cache: dict = {}
+_profile_cache: dict = {}
+_PROFILE_CACHE_TTL = 3600.0
+
+
 def get_profile_data(profile_id: int) -> str:
     """Gets persona description for a profile."""
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+    cached = _profile_cache.get(profile_id)
+    if cached is not None and time.monotonic() - cached[1] < _PROFILE_CACHE_TTL:
+        return cached[0]
+
+    with get_db_readonly() as conn:
+        with conn.cursor() as cur:
             # Get persona description
-            cur.execute(
-                "SELECT persona_description FROM profiles WHERE profile_id = %(profile_id)s;",
-                {'profile_id': profile_id}
-            )
+            cur.execute("EXECUTE q_profile_data (%s);", (profile_id,))
             persona_row = cur.fetchone()
             if not persona_row:
                 raise ProfileNotFoundError(f"Profile with ID {profile_id} not found")
 
-            persona_description = persona_row['persona_description']
+            persona_description = persona_row[0]
+            _profile_cache[profile_id] = (persona_description, time.monotonic())
 
             logger.info(f"Retrieved persona description for profile {profile_id}")
             return persona_description
@@ -125,8 +220,8 @@ def get_profile_data(profile_id: int) -> str:
 
 def get_context_videos_by_name(context_name: str) -> List[str]:
     """Gets the list of video IDs for a named context."""
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+    with get_db_readonly() as conn:
+        with conn.cursor() as cur:
             cur.execute(
                 "SELECT video_ids FROM experiment_contexts WHERE context_name = %s;",
                 (context_name,)
@@ -135,11 +230,16 @@ def get_context_videos_by_name(context_name: str) -> List[str]:
             if not context_row:
                 raise ContextNotFoundError(f"Context with name '{context_name}' not found in the database.")
 
-            video_ids = context_row['video_ids']
+            video_ids = context_row[0]
             logger.info(f"Retrieved {len(video_ids)} videos for context '{context_name}'")
             return video_ids
 
 
+# Above this size, insert_context_videos switches from a parameterized
+# statement to COPY, the fastest bulk-ingest path Postgres offers
+_CONTEXT_COPY_THRESHOLD = 1000
+
+
 def insert_context_videos(video_context_ids: List[str]) -> None:
     """Pre-inserts context videos to ensure they exist for foreign key constraints."""
     if not video_context_ids:
@@ -147,36 +247,86 @@ def insert_context_videos(video_context_ids: List[str]) -> None:
 
     logger.info(f"Pre-loading {len(video_context_ids)} context videos into database")
 
-    query = """
-        INSERT INTO videos (video_youtube_id, title) 
-        VALUES (%(video_id)s, %(title)s) 
-        ON CONFLICT (video_youtube_id) DO NOTHING;
-    """
-
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            # Use executemany for better performance
-            data = [
-                {'video_id': video_id, 'title': 'Context Video - Title Pending Enrichment'}
-                for video_id in video_context_ids
-            ]
-            cur.executemany(query, data)
+            if len(video_context_ids) > _CONTEXT_COPY_THRESHOLD:
+                # Bulk path: COPY the ids into a temp table, then one
+                # INSERT ... SELECT applies the conflict handling. COPY
+                # streams rows without per-value parameter binding, which
+                # wins once contexts reach the thousands of videos.
+                cur.execute(
+                    "CREATE TEMP TABLE tmp_context_videos (video_youtube_id VARCHAR(20)) "
+                    "ON COMMIT DROP;"
+                )
+                buffer = io.StringIO("".join(f"{vid}\n" for vid in video_context_ids))
+                cur.copy_expert(
+                    "COPY tmp_context_videos (video_youtube_id) FROM STDIN", buffer
+                )
+                cur.execute("""
+                    INSERT INTO videos (video_youtube_id, title)
+                    SELECT DISTINCT video_youtube_id, 'Context Video - Title Pending Enrichment'
+                    FROM tmp_context_videos
+                    ON CONFLICT (video_youtube_id) DO NOTHING;
+                """)
+            else:
+                # One statement for a normal-sized batch: the list goes over
+                # as a single array parameter, expanded server-side
+                cur.execute("""
+                    INSERT INTO videos (video_youtube_id, title)
+                    SELECT unnest(%s::text[]), 'Context Video - Title Pending Enrichment'
+                    ON CONFLICT (video_youtube_id) DO NOTHING;
+                """, (video_context_ids,))
             conn.commit()
             logger.info(f"Successfully pre-loaded {len(video_context_ids)} context videos")
 
 
-def get_video_duration(video_id: str) -> int:
-    """Gets video duration from database."""
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+def prefetch_video_durations(video_ids: List[str]) -> None:
+    """Warms the duration cache for a batch of videos with a single query.
+
+    Called at the start of the context phase so the per-video
+    get_video_duration lookups become cache hits instead of one SELECT each.
+    """
+    missing = [vid for vid in video_ids if vid not in _duration_cache]
+    if not missing:
+        return
+
+    with get_db_readonly() as conn:
+        with conn.cursor() as cur:
             cur.execute(
-                "SELECT duration_seconds FROM videos WHERE video_youtube_id = %(video_id)s;",
-                {'video_id': video_id}
+                "SELECT video_youtube_id, duration_seconds FROM videos "
+                "WHERE video_youtube_id = ANY(%s) AND duration_seconds IS NOT NULL;",
+                (missing,)
             )
+            for video_youtube_id, duration_seconds in cur.fetchall():
+                _duration_cache[video_youtube_id] = duration_seconds
+    logger.info(f"Prefetched durations for {len(missing)} videos")
+
+
+def get_video_durations(video_ids: List[str]) -> dict:
+    """Fetches durations for a batch of videos with one query.
+
+    Returns {video_id: seconds} with 0 for videos the database does not
+    know yet; the duration cache is warmed as a side effect, so later
+    get_video_duration calls for these ids stay off the wire too.
+    """
+    prefetch_video_durations(video_ids)
+    return {video_id: _duration_cache.get(video_id, 0) for video_id in video_ids}
+
+
+def get_video_duration(video_id: str) -> int:
+    """Gets video duration from database."""
+    cached = _duration_cache.get(video_id)
+    if cached is not None:
+        return cached
+
+    with get_db_readonly() as conn:
+        with conn.cursor() as cur:
+            cur.execute("EXECUTE q_video_duration (%s);", (video_id,))
             result_row = cur.fetchone()
-            
-            if result_row and result_row['duration_seconds'] is not None:
-                duration = result_row['duration_seconds']
+
+            if result_row and result_row[0] is not None:
+                duration = result_row[0]
+                _duration_cache[video_id] = duration
                 logger.info(f"Found pre-existing duration in DB: {duration} seconds for video {video_id}")
                 return duration
             
@@ -184,6 +334,19 @@ def get_video_duration(video_id: str) -> int:
             return 0
 
 
+@contextmanager
+def scraping_transaction():
+    """Groups several write helpers into one transaction.
+
+    Pass the yielded connection as conn= to insert_video_and_recommendations
+    and log_persona_filter: the statements then share a single connection
+    checkout and commit atomically on exit instead of once per helper.
+    """
+    with get_db_connection() as conn:
+        yield conn
+        conn.commit()
+
+
 def insert_video_and_recommendations(
         session_id: int,
         depth: int,
@@ -193,11 +356,16 @@ def insert_video_and_recommendations(
         justification: Optional[str] = None,
         is_context: bool = False,
         profile_id_at_choice: Optional[int] = None,
-        choice_method: Optional[str] = None
+        choice_method: Optional[str] = None,
+        conn=None
 ) -> None:
     """
     Inserts video metadata and the full list of recommendations into the database.
     It specifically logs which video was chosen, why, and under which persona/method.
+
+    With conn (a scraping_transaction connection), the statements join the
+    caller's transaction and the caller commits; otherwise the function uses
+    its own connection and commits itself.
     """
 
     from models import RecommendationsList
@@ -218,114 +386,190 @@ def insert_video_and_recommendations(
     # Query to insert or update video details. This ensures every seen video has an entry.
     video_query = """
                   INSERT INTO videos (video_youtube_id, title, duration_seconds)
-                  VALUES (%(video_id)s, %(title)s, %(duration_seconds)s) ON CONFLICT (video_youtube_id) DO \
+                  VALUES %s ON CONFLICT (video_youtube_id) DO
                   UPDATE SET
-                      title = EXCLUDED.title, \
-                      duration_seconds = CASE \
-                      WHEN videos.last_enriched_at IS NULL THEN EXCLUDED.duration_seconds \
+                      title = EXCLUDED.title,
+                      duration_seconds = CASE
+                      WHEN videos.last_enriched_at IS NULL THEN EXCLUDED.duration_seconds
                       ELSE videos.duration_seconds
-                  END; \
+                  END
+                  WHERE videos.title IS DISTINCT FROM EXCLUDED.title
+                     OR (videos.last_enriched_at IS NULL
+                         AND videos.duration_seconds IS DISTINCT FROM EXCLUDED.duration_seconds);
                   """
 
     # Query to log every single recommendation.
     recommendation_query = """
-                           INSERT INTO recommendation_log (session_id, depth, source_video_id, recommended_video_id, \
-                                                           recommendation_rank, recommendation_source, was_selected, \
-                                                           justification, view_count_when_recommended, \
-                                                           was_during_context, \
-                                                           profile_id_at_choice, choice_method) \
-                           VALUES (%(session_id)s, %(depth)s, %(source_video_id)s, %(recommended_video_id)s, \
-                                   %(recommendation_rank)s, %(recommendation_source)s, %(was_selected)s, \
-                                   %(justification)s, %(view_count_when_recommended)s, %(was_during_context)s, \
-                                   %(profile_id_at_choice)s, %(choice_method)s); \
+                           INSERT INTO recommendation_log (session_id, depth, source_video_id, recommended_video_id,
+                                                           recommendation_rank, recommendation_source, was_selected,
+                                                           justification, view_count_when_recommended,
+                                                           was_during_context,
+                                                           profile_id_at_choice, choice_method)
+                           VALUES %s;
                            """
 
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            video_data = []
-            recommendation_data = []
-
-            for i, rec in enumerate(recommendations):
-                was_selected = (rec["video_id"] == chosen_video_id)
-
-                # Prepare data for the 'videos' table
-                video_data.append({
-                    'video_id': rec["video_id"],
-                    'title': rec["title"],
-                    'duration_seconds': parse_duration(rec.get("duration"))
-                })
-
-                # Prepare data for the 'recommendation_log' table
-                recommendation_data.append({
-                    'session_id': session_id,
-                    'depth': depth,
-                    'source_video_id': source_video_id,
-                    'recommended_video_id': rec["video_id"],
-                    'recommendation_rank': i + 1,
-                    'recommendation_source': rec.get("recommendation_source", "context" if is_context else "sidebar"),
-                    'was_selected': was_selected,
-                    'justification': justification if was_selected else None,
-                    'view_count_when_recommended': rec.get("views"),
-                    'was_during_context': is_context,
-                    'profile_id_at_choice': profile_id_at_choice if was_selected else None,
-                    'choice_method': choice_method if was_selected else None
-                })
-
-            video_data.sort(key=lambda x: x['video_id'])
-
-            # Use executemany for efficient batch inserting
+    videos_by_id = {}
+    recommendation_data = []
+
+    for i, rec in enumerate(recommendations):
+        was_selected = (rec["video_id"] == chosen_video_id)
+
+        # Prepare data for the 'videos' table. Keyed by video_id: the same
+        # video can appear twice in one batch (homepage and sidebar overlap
+        # on the no-interesting-video fallback), and a multi-row
+        # ON CONFLICT DO UPDATE raises if it touches the same row twice
+        videos_by_id[rec["video_id"]] = (
+            rec["video_id"],
+            rec["title"],
+            parse_duration(rec.get("duration"))
+        )
+
+        # Prepare data for the 'recommendation_log' table
+        recommendation_data.append((
+            session_id,
+            depth,
+            source_video_id,
+            rec["video_id"],
+            i + 1,
+            rec.get("recommendation_source", "context" if is_context else "sidebar"),
+            was_selected,
+            justification if was_selected else None,
+            rec.get("views"),
+            is_context,
+            profile_id_at_choice if was_selected else None,
+            choice_method if was_selected else None
+        ))
+
+    video_data = sorted(videos_by_id.values())
+
+    def _execute_inserts(target_conn):
+        with target_conn.cursor() as cur:
+            # execute_values sends each batch as one multi-row INSERT
+            # instead of one statement round trip per row
             if video_data:
-                cur.executemany(video_query, video_data)
+                psycopg2.extras.execute_values(cur, video_query, video_data)
 
             if recommendation_data:
-                cur.executemany(recommendation_query, recommendation_data)
+                psycopg2.extras.execute_values(cur, recommendation_query, recommendation_data)
 
-            conn.commit()
+    if conn is not None:
+        _execute_inserts(conn)  # The caller owns the transaction and commits
+    else:
+        with get_db_connection() as own_conn:
+            _execute_inserts(own_conn)
+            own_conn.commit()
+
+    logger.info(
+        f"Inserted {len(video_data)} videos and {len(recommendation_data)} recommendation logs for session {session_id}")
+
+# --- Asynchronous write-behind for step logging ---
+#
+# Persisting a step's videos and recommendation log is bookkeeping the
+# browser never waits on. Steps enqueue their payload and a single writer
+# thread drains it, so navigation continues immediately while the batched
+# inserts run in the background.
+
+_write_queue: Optional[Queue] = None
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _writer_loop() -> None:
+    while True:
+        item = _write_queue.get()
+        try:
+            if item is None:
+                break
+            args, kwargs = item
+            filter_log = kwargs.pop('filter_log', None)
+            if filter_log is not None:
+                # The step's persona-filter verdict and its recommendation
+                # rows land atomically in one transaction
+                with scraping_transaction() as txn_conn:
+                    insert_video_and_recommendations(*args, conn=txn_conn, **kwargs)
+                    log_persona_filter(*filter_log, conn=txn_conn)
+            else:
+                insert_video_and_recommendations(*args, **kwargs)
+        except Exception as e:
+            # The experiment must not die on a logging hiccup; the error is
+            # recorded and the writer keeps draining
+            logger.error(f"Async step write failed: {e}")
+        finally:
+            _write_queue.task_done()
+
+
+def _ensure_async_writer() -> None:
+    global _write_queue, _writer_thread
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _write_queue = Queue()
+            _writer_thread = threading.Thread(
+                target=_writer_loop, name="db-writer", daemon=True
+            )
+            _writer_thread.start()
+            logger.info("Started asynchronous database writer thread")
+
+
+def insert_video_and_recommendations_async(*args, **kwargs) -> None:
+    """Queues a step's videos/recommendations for the background writer.
+
+    An optional filter_log keyword (the log_persona_filter argument tuple)
+    rides along and is committed in the same transaction as the step.
+    """
+    _ensure_async_writer()
+    _write_queue.put((args, kwargs))
+
+
+def flush_async_writer() -> None:
+    """Blocks until every queued write has been persisted."""
+    if _write_queue is not None:
+        _write_queue.join()
+
+
+def stop_async_writer() -> None:
+    """Drains outstanding writes and stops the writer thread."""
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is not None and _writer_thread.is_alive():
+            _write_queue.put(None)
+            _writer_thread.join()
+        _writer_thread = None
 
-            logger.info(
-                f"Inserted {len(video_data)} videos and {len(recommendation_data)} recommendation logs for session {session_id}")
 
 def log_persona_filter(
-    session_id: int, 
-    video_id: str, 
-    was_filtered: bool, 
-    justification: str, 
-    transcript: str
+    session_id: int,
+    video_id: str,
+    was_filtered: bool,
+    justification: str,
+    transcript: str,
+    conn=None
 ) -> None:
-    """Logs persona filter results."""
-    query = """
-        INSERT INTO persona_filter_logs (
-            session_id, video_id, was_filtered, filter_justification, video_transcript
-        ) VALUES (
-            %(session_id)s, %(video_id)s, %(was_filtered)s, 
-            %(filter_justification)s, %(video_transcript)s
-        );
+    """Logs persona filter results.
+
+    With conn (a scraping_transaction connection), the insert joins the
+    caller's transaction; otherwise it commits on its own connection.
     """
-    
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(query, {
-                'session_id': session_id,
-                'video_id': video_id,
-                'was_filtered': was_filtered,
-                'filter_justification': justification,
-                'video_transcript': transcript
-            })
-            conn.commit()
-            logger.info(f"Logged persona filter result for video {video_id} in session {session_id}")
+    def _execute_log(target_conn):
+        with target_conn.cursor() as cur:
+            cur.execute(
+                "EXECUTE q_log_persona_filter (%s, %s, %s, %s, %s);",
+                (session_id, video_id, was_filtered, justification, transcript)
+            )
+
+    if conn is not None:
+        _execute_log(conn)  # The caller owns the transaction and commits
+    else:
+        with get_db_connection() as own_conn:
+            _execute_log(own_conn)
+            own_conn.commit()
+    logger.info(f"Logged persona filter result for video {video_id} in session {session_id}")
 
 
 def update_session_status(session_id: int, status: str) -> None:
     """Updates session status."""
-    query = """
-        UPDATE sessions 
-        SET status = %(status)s, end_time = NOW() 
-        WHERE session_id = %(session_id)s;
-    """
-    
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(query, {'status': status, 'session_id': session_id})
+            cur.execute("EXECUTE q_update_session_status (%s, %s);", (status, session_id))
             if cur.rowcount == 0:
                 logger.warning(f"No session found with ID {session_id}")
             else:
@@ -0,0 +1,131 @@
+"""Direct InnerTube API access for watch-page recommendations.
+
+YouTube's watch page fills its sidebar from the InnerTube ``next`` endpoint.
+Calling that endpoint directly returns the same recommendations as JSON in a
+fraction of the browser's render time: no lazy-load scrolling, no HTML
+parsing. The Selenium session's cookies are copied into the HTTP session
+first so the API sees the same consent/visitor state as the driven browser.
+"""
+import logging
+from typing import Optional
+
+import requests
+
+from models import VideoRecommendation, RecommendationsList
+
+logger = logging.getLogger(__name__)
+
+INNERTUBE_NEXT_URL = "https://www.youtube.com/youtubei/v1/next"
+
+# The web client context the watch page itself sends
+_CLIENT_CONTEXT = {
+    "client": {
+        "clientName": "WEB",
+        "clientVersion": "2.20240620.05.00",
+    }
+}
+
+_VIEW_SUFFIXES = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """One keep-alive session for all InnerTube calls (TLS reuse + gzip)."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update({
+            "Content-Type": "application/json",
+            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                          "(KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+        })
+    return _session
+
+
+def sync_browser_cookies(driver) -> None:
+    """Copies the Selenium session's YouTube cookies into the API session."""
+    session = _get_session()
+    try:
+        for cookie in driver.get_cookies():
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain') or '.youtube.com'
+            )
+    except Exception as e:
+        logger.warning(f"Could not sync browser cookies to InnerTube session: {e}")
+
+
+def _parse_view_count(text) -> int:
+    """Parses '1.2M views' style strings via a suffix lookup table."""
+    if not text:
+        return 0
+    token = text.split()[0].replace(',', '').replace(' ', '')
+    multiplier = 1
+    if token and token[-1].upper() in _VIEW_SUFFIXES:
+        multiplier = _VIEW_SUFFIXES[token[-1].upper()]
+        token = token[:-1]
+    try:
+        return int(float(token) * multiplier)
+    except ValueError:
+        return 0
+
+
+def _renderer_to_recommendation(renderer) -> Optional[VideoRecommendation]:
+    """Maps a compactVideoRenderer JSON blob to a VideoRecommendation."""
+    try:
+        video_id = renderer["videoId"]
+        title = renderer["title"]["simpleText"]
+        publisher = renderer["longBylineText"]["runs"][0]["text"]
+        views = _parse_view_count(
+            renderer.get("shortViewCountText", {}).get("simpleText"))
+        duration = renderer.get("lengthText", {}).get("simpleText")
+    except (KeyError, IndexError):
+        return None
+
+    if not (title and publisher and duration):
+        return None
+
+    return VideoRecommendation(
+        title=title,
+        publisher=publisher,
+        views=views,
+        video_id=video_id,
+        link=f"https://www.youtube.com/watch?v={video_id}",
+        duration=duration,
+    )
+
+
+def fetch_recommendations(video_id: str, limit: int = 20) -> RecommendationsList:
+    """Fetches the watch-page sidebar recommendations for a video as JSON."""
+    response = _get_session().post(
+        INNERTUBE_NEXT_URL,
+        params={"prettyPrint": "false"},
+        json={"context": _CLIENT_CONTEXT, "videoId": video_id},
+        timeout=15,
+    )
+    response.raise_for_status()
+
+    results = (
+        response.json()
+        .get("contents", {})
+        .get("twoColumnWatchNextResults", {})
+        .get("secondaryResults", {})
+        .get("secondaryResults", {})
+        .get("results", [])
+    )
+
+    recommendations = []
+    for item in results:
+        renderer = item.get("compactVideoRenderer")
+        if not renderer:
+            # Mixes (compactRadioRenderer), ads and continuations are skipped
+            continue
+        rec = _renderer_to_recommendation(renderer)
+        if rec:
+            recommendations.append(rec)
+        if len(recommendations) >= limit:
+            break
+
+    logger.info(f"InnerTube returned {len(recommendations)} recommendations for {video_id}")
+    return RecommendationsList(recommendations=recommendations)
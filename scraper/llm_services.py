@@ -1,7 +1,11 @@
 """Modern LLM service integrations with structured output using LangChain."""
-import json
+import hashlib
 import logging
+from functools import lru_cache
 from typing import List, Any, Literal
+
+import httpx
+import orjson
 from pydantic import BaseModel, Field, create_model
 
 from langchain_openai import ChatOpenAI, AzureChatOpenAI
@@ -9,9 +13,10 @@ from langchain_core.prompts import ChatPromptTemplate
 
 from config import get_config
 from models import (
-    VideoRecommendation, 
-    RecommendationsList, 
-    VideoChoice, 
+    VideoRecommendation,
+    RecommendationsList,
+    VideoChoice,
+    BatchChoiceResponse,
     RelevanceCheck,
     LLMError,
     UnsupportedProviderError
@@ -19,9 +24,98 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+# Every structured call uses the same two-message shape; built once
+_STRUCTURED_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "{system_prompt}"),
+    ("human", "{user_prompt}")
+])
+
+# Ready-to-invoke chains keyed by (provider, model, response_model).
+# with_structured_output derives a JSON schema from the response model on
+# every call, which is pure rebuild cost for the handful of (model, schema)
+# pairs a run actually uses. Dynamic choice models are cached themselves
+# (_get_video_choice_model), so they make stable keys here too.
+_structured_chain_cache: dict = {}
+
+
+def _get_structured_chain(provider: str, model: str, response_model):
+    key = (provider, model, response_model)
+    chain = _structured_chain_cache.get(key)
+    if chain is None:
+        llm = get_langchain_llm(provider, model)
+        chain = _STRUCTURED_PROMPT | llm.with_structured_output(response_model, method="json_schema")
+        _structured_chain_cache[key] = chain
+    return chain
+
+
+# Prompt text for the per-step decision calls, assembled as
+# persona-first templates: every supported provider is OpenAI-compatible
+# and caches request prefixes automatically, so the large stable parts
+# (shared persona header, per-task instructions) must be byte-identical
+# from one step to the next, with the variable transcript/recommendation
+# payload confined to the user message. Both tasks share the same
+# leading header so their cached prefixes overlap up to the end of the
+# persona description.
+_PERSONA_HEADER = (
+    "You are simulating a YouTube user with the following persona:\n\n"
+    "{persona_description}\n\n"
+)
+
+_CHOOSE_VIDEO_TASK = (
+    "Task: You are shown a list of recommended YouTube videos, each with its title and channel "
+    "name. Based on the persona’s preferences, stance, language, and personality traits, decide which "
+    "single video the persona will watch next.\n"
+    "Instructions :\n"
+    "- If one of the videos strongly matches the persona’s interests and aligns with its preferences, choose it.\n"
+    "- If multiple videos are equally relevant, pick the one that best fits the persona’s stance and viewing behavior.\n"
+    "- If none of the videos is worth watching, answer 'no_interesting_video'. This will reload the homepage for new recommendations.\n\n"
+    "Provide your choice with a clear justification.\n"
+)
+
+_CHECK_RELEVANCE_TASK = (
+    "Task: You have watched the first {transcript_seconds} seconds of a YouTube video. "
+    "Based on the transcript content from this time period, decide whether the persona "
+    "continues watching the video until the end or stops watching now.\n\n"
+    "- Set is_relevant to True if the content aligns with the persona’s preferences, stance, and language, "
+    "or is interesting enough to watch fully.\n"
+    "- Set is_relevant to False if the content contradicts the persona’s stance, is uninteresting, or irrelevant.\n\n"
+    "Provide your choice with a clear justification.\n"
+)
 
+
+# Exact-match response caches for the per-step decision calls. Sessions
+# revisit videos and re-offer near-identical sidebars, so identical
+# (persona, input) pairs recur and each hit saves a billed multi-second
+# API round trip. Keys are SHA-256 over every prompt-determining field,
+# so only byte-identical requests can ever share a response.
+_RELEVANCE_CACHE: dict = {}
+_CHOICE_CACHE: dict = {}
+_RESPONSE_CACHE_MAX = 4096
+
+
+def _response_cache_key(*parts) -> bytes:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\x1f")
+    return digest.digest()
+
+
+def _response_cache_put(cache: dict, key: bytes, value) -> None:
+    if len(cache) >= _RESPONSE_CACHE_MAX:
+        # Drop the oldest entries (dicts preserve insertion order)
+        for old_key in list(cache)[:_RESPONSE_CACHE_MAX // 4]:
+            del cache[old_key]
+    cache[key] = value
+
+
+@lru_cache(maxsize=None)
 def validate_provider(provider: str) -> None:
-    """Validate that the provider supports structured output."""
+    """Validate that the provider supports structured output.
+
+    Memoized: the answer is static per provider name, and the check runs
+    for every task config on every get_llm_configs call.
+    """
     supported_providers = ["openai", "azure_openai", "openrouter"]
     if provider not in supported_providers:
         raise UnsupportedProviderError(
@@ -30,8 +124,24 @@ def validate_provider(provider: str) -> None:
         )
 
 
+@lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """Shared HTTP client for all LLM calls, so TLS connections are kept
+    alive and reused across calls instead of re-handshaking every time."""
+    return httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+        timeout=httpx.Timeout(120.0, connect=10.0)
+    )
+
+
+@lru_cache(maxsize=8)
 def get_langchain_llm(provider: str, model: str) -> ChatOpenAI:
-    """Get the appropriate LangChain LLM based on provider."""
+    """Get the appropriate LangChain LLM based on provider.
+
+    Memoized per (provider, model): client construction re-reads config and
+    sets up an OpenAI SDK client each time, which is pure overhead when the
+    same one or two models are called at every scraping step.
+    """
     config = get_config()
 
     if provider == "azure_openai":
@@ -44,7 +154,8 @@ def get_langchain_llm(provider: str, model: str) -> ChatOpenAI:
             api_version="2025-04-01-preview",
             azure_endpoint=endpoint,
             model=model,
-            temperature=0.1
+            temperature=0.1,
+            http_client=_get_http_client()
         )
     if provider == "openai":
         api_key = config.get_api_key("openai")
@@ -53,7 +164,8 @@ def get_langchain_llm(provider: str, model: str) -> ChatOpenAI:
         return ChatOpenAI(
             api_key=api_key,
             model=model,
-            temperature=0.1
+            temperature=0.1,
+            http_client=_get_http_client()
         )
     if provider == "openrouter":
         api_key = config.get_api_key("openrouter")
@@ -63,13 +175,33 @@ def get_langchain_llm(provider: str, model: str) -> ChatOpenAI:
             base_url="https://openrouter.ai/api/v1",
             api_key=api_key,
             model=model,
-            temperature=0.1
+            temperature=0.1,
+            http_client=_get_http_client()
         )
 
     raise UnsupportedProviderError(
         f"LangChain client not available for {provider}"
     )
 
+@lru_cache(maxsize=256)
+def _get_video_choice_model(video_ids: tuple) -> type[BaseModel]:
+    """Builds the per-step choice model whose video_id field is constrained
+    to the offered recommendations (plus the no_interesting_video escape).
+
+    Literal is parameterized directly with the id tuple — no exec/source
+    generation needed — and the resulting model class is cached per id set,
+    since building a Pydantic model (and its JSON schema) is not free.
+    """
+    video_id_type = Literal[video_ids + ("no_interesting_video",)]
+    return create_model(
+        'DynamicVideoChoice',
+        video_id=(video_id_type, Field(
+            description="The chosen video ID, if no interesting video are found, choose the video_id no_interesting_video."
+        )),
+        justification=(str, Field(description="Explanation for the choice"))
+    )
+
+
 def call_llm_structured(
     provider: str,
     model: str,
@@ -94,18 +226,8 @@ def call_llm_structured(
     logger.info("Calling %s with model %s", provider, model)
 
     try:
-        # Get LangChain LLM
-        llm = get_langchain_llm(provider, model)
-        llm_structured = llm.with_structured_output(response_model, method="json_schema")
-
-        # Create prompt template
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "{system_prompt}"),
-            ("human", "{user_prompt}")
-        ])
-
-        # Create chain
-        chain = prompt | llm_structured
+        # Get the cached prompt | structured-LLM chain
+        chain = _get_structured_chain(provider, model, response_model)
 
         # Execute chain
         response = chain.invoke({
@@ -148,8 +270,8 @@ def parse_recommendations_with_llm(
 **Critical:** Only return videos that have all required information: title, publisher, views, video_id, link, and duration."""
 
     user_prompt = (
-        f"Parse these YouTube recommendation HTML blocks:\n\n"
-        f"{json.dumps(recommendations_html_list)}"
+        "Parse these YouTube recommendation HTML blocks:\n\n"
+        + orjson.dumps(recommendations_html_list).decode()
     )
 
     try:
@@ -181,45 +303,31 @@ def choose_video_with_llm(
         raise LLMError("No recommendations provided for video selection")
 
     # Extract video IDs from recommendations
-    video_ids = [rec.video_id for rec in recommendations.recommendations]
-    
-    # Create a dynamic Literal type using exec to construct it properly
-    literal_args = ', '.join(repr(vid) for vid in video_ids) + ', ' + repr("no_interesting_video")
-    literal_type_code = f"Literal[{literal_args}]"
-    
-    logger.debug("Creating dynamic Literal type with video IDs: %s", video_ids)
-    logger.debug("Literal type code: %s", literal_type_code)
-    
-    # Create the type in a safe namespace
-    namespace = {'Literal': Literal}
-    exec(f"video_id_type = {literal_type_code}", namespace)
-    video_id_type = namespace['video_id_type']
-    
-    DynamicVideoChoice = create_model(
-        'DynamicVideoChoice',
-        video_id=(video_id_type, Field(
-            description=f"The chosen video ID, if no interesting video are found, choose the video_id no_interesting_video."
-        )),
-        justification=(str, Field(description="Explanation for the choice"))
-    )
-
-    system_prompt = (
-        f"You are simulating a YouTube user with the following persona:\n\n{persona_description}\n\n"
-        f"Task: You are shown a list of recommended YouTube videos, each with its title and channel "
-        f"name. Based on the persona’s preferences, stance, language, and personality traits, decide which "
-        f"single video the persona will watch next.\n"
-        f"Instructions :\n"
-        f"- If one of the videos strongly matches the persona’s interests and aligns with its preferences, choose it.\n"
-        f"- If multiple videos are equally relevant, pick the one that best fits the persona’s stance and viewing behavior.\n"
-        f"- If none of the videos is worth watching, answer {repr('no_interesting_video')}. This will reload the homepage for new recommendations.\n\n"
-        f"Provide your choice with a clear justification.\n"
-    )
+    video_ids = tuple(rec.video_id for rec in recommendations.recommendations)
 
     # Convert Pydantic model to dict for JSON serialization
     recommendations_dict = [rec.model_dump() for rec in recommendations.recommendations]
     user_prompt = (
-        f"Choose from these videos:\n\n"
-        f"{json.dumps(recommendations_dict, indent=2)}"
+        "Choose from these videos:\n\n"
+        + orjson.dumps(recommendations_dict, option=orjson.OPT_INDENT_2).decode()
+    )
+
+    # Keyed on the full serialized prompt, not just the video IDs: the same
+    # set offered in a different order or with updated metadata is a
+    # different stimulus and must be asked again
+    cache_key = _response_cache_key(provider, model, persona_description,
+                                    user_prompt)
+    cached = _CHOICE_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("Video choice served from cache")
+        return cached
+
+    logger.debug("Creating dynamic choice model with video IDs: %s", video_ids)
+    DynamicVideoChoice = _get_video_choice_model(video_ids)
+
+    system_prompt = (
+        _PERSONA_HEADER.format(persona_description=persona_description)
+        + _CHOOSE_VIDEO_TASK
     )
 
     try:
@@ -232,16 +340,82 @@ def choose_video_with_llm(
         )
         
         # Convert the dynamic model result back to the standard VideoChoice model
-        return VideoChoice(
+        choice = VideoChoice(
             video_id=result.video_id,
             justification=result.justification
         )
+        _response_cache_put(_CHOICE_CACHE, cache_key, choice)
+        return choice
 
     except Exception as e:
         logger.error("Failed to choose video: %s", e)
         raise LLMError(f"Failed to choose video: {e}") from e
 
 
+def batch_choose_video_with_llm(
+    provider: str,
+    model: str,
+    personas: dict,
+    recommendations: RecommendationsList
+) -> dict:
+    """Resolve several personas' next-video choices in one structured call.
+
+    Every persona sees the same recommendation list, so one request with
+    the personas enumerated replaces len(personas) separate round trips
+    (useful when a mixed_persona experiment re-offers one page to several
+    profiles). Returns {profile_id: VideoChoice}; profiles the model
+    omitted are absent from the result.
+    """
+    if not recommendations.recommendations:
+        raise LLMError("No recommendations provided for video selection")
+    if not personas:
+        return {}
+
+    personas_block = "\n\n".join(
+        f"Profile {profile_id}:\n{description}"
+        for profile_id, description in sorted(personas.items())
+    )
+    system_prompt = (
+        "You are simulating several YouTube users at once, one per persona listed below:\n\n"
+        f"{personas_block}\n\n"
+        "Task: All personas are shown the same list of recommended YouTube videos, each with its "
+        "title and channel name. For every profile, decide independently which single video that "
+        "persona will watch next, following that persona's preferences, stance, language, and "
+        "personality traits.\n"
+        "Instructions :\n"
+        "- Answer with exactly one choice per profile, carrying its profile_id.\n"
+        "- If none of the videos is worth watching for a persona, answer 'no_interesting_video' "
+        "for that profile.\n\n"
+        "Provide each choice with a clear justification.\n"
+    )
+
+    recommendations_dict = [rec.model_dump() for rec in recommendations.recommendations]
+    user_prompt = (
+        "Choose from these videos:\n\n"
+        + orjson.dumps(recommendations_dict, option=orjson.OPT_INDENT_2).decode()
+    )
+
+    try:
+        result = call_llm_structured(
+            provider=provider,
+            model=model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response_model=BatchChoiceResponse
+        )
+        return {
+            choice.profile_id: VideoChoice(
+                video_id=choice.video_id,
+                justification=choice.justification
+            )
+            for choice in result.choices
+        }
+
+    except Exception as e:
+        logger.error("Failed to batch-choose videos: %s", e)
+        raise LLMError(f"Failed to batch-choose videos: {e}") from e
+
+
 def check_video_relevance_with_llm(
     provider: str,
     model: str,
@@ -251,15 +425,16 @@ def check_video_relevance_with_llm(
 ) -> RelevanceCheck:
     """Check video relevance using structured output."""
 
+    cache_key = _response_cache_key(provider, model, persona_description,
+                                    transcript_text, transcript_seconds)
+    cached = _RELEVANCE_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("Relevance check served from cache")
+        return cached
+
     system_prompt = (
-        f"You are simulating a YouTube user with the following persona:\n\n{persona_description}\n\n"
-        f"Task: You have watched the first {transcript_seconds} seconds of a YouTube video. "
-        f"Based on the transcript content from this time period, decide whether the persona "
-        f"continues watching the video until the end or stops watching now.\n\n"
-        f"- Set is_relevant to True if the content aligns with the persona’s preferences, stance, and language, "
-        f"or is interesting enough to watch fully.\n"
-        f"- Set is_relevant to False if the content contradicts the persona’s stance, is uninteresting, or irrelevant.\n\n"
-        f"Provide your choice with a clear justification.\n"
+        _PERSONA_HEADER.format(persona_description=persona_description)
+        + _CHECK_RELEVANCE_TASK.format(transcript_seconds=transcript_seconds)
     )
 
     user_prompt = f"Analyze this video transcript:\n\n{transcript_text}"
@@ -272,6 +447,7 @@ def check_video_relevance_with_llm(
             user_prompt=user_prompt,
             response_model=RelevanceCheck
         )
+        _response_cache_put(_RELEVANCE_CACHE, cache_key, result)
         return result
 
     except Exception as e:
@@ -1,4 +1,5 @@
 """Pydantic models for the YouTube scraper."""
+from dataclasses import dataclass
 from typing import List
 from pydantic import BaseModel, Field
 
@@ -21,12 +22,32 @@ class RecommendationsList(BaseModel):
     )
 
 
-class VideoChoice(BaseModel):
-    """Model for video selection decision."""
-    video_id: str = Field(description="The chosen video ID")
+@dataclass(frozen=True, slots=True)
+class VideoChoice:
+    """The video selection decision handed back to the scraper.
+
+    A plain result carrier: unlike RelevanceCheck and RecommendationsList
+    it is never used as a structured-output schema (the LLM answers
+    through the dynamic choice model), so it needs no Pydantic machinery.
+    """
+    video_id: str
+    justification: str
+
+
+class ProfileVideoChoice(BaseModel):
+    """One profile's selection inside a batched choice response."""
+    profile_id: int = Field(description="The profile this choice belongs to")
+    video_id: str = Field(description="The chosen video ID, or no_interesting_video")
     justification: str = Field(description="Explanation for the choice (one or two sentences)")
 
 
+class BatchChoiceResponse(BaseModel):
+    """Model for a multi-persona video selection decision."""
+    choices: List[ProfileVideoChoice] = Field(
+        description="Exactly one choice per requested profile"
+    )
+
+
 class RelevanceCheck(BaseModel):
     """Model for video relevance assessment."""
     is_relevant: bool = Field(description="Whether the video is relevant to the persona")
@@ -1,16 +1,46 @@
 """Parallel scraper wrapper for running multiple concurrent sessions."""
+import base64
 import os
 import sys
 import logging
 import multiprocessing
 from pathlib import Path
 
-# Import the main scraper
-from scraper_main import main as scraper_main
 from config import get_config, reload_config
 
 logger = logging.getLogger(__name__)
 
+# scraper_main (and through it selenium, langchain, lxml, pydantic model
+# builds) is imported inside the workers, not here: with the spawn start
+# method the parent should stay cheap to re-import, and with fork the
+# import happens once wherever it is first needed.
+
+# fork shares the parent's already-imported modules with workers
+# copy-on-write; spawn (the only option on some platforms) re-imports
+# everything per worker
+_MP_CONTEXT = multiprocessing.get_context(
+    'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+)
+
+
+def materialize_config_from_env():
+    """
+    If the GUI passed the experiment config inline via CONFIG_B64, write it to
+    a tmpfs-backed file and point CONFIG_FILE at it.
+
+    Config loading and the per-worker reload keep working unchanged; when
+    CONFIG_B64 is absent the usual CONFIG_FILE bind-mount path applies.
+    """
+    config_b64 = os.getenv('CONFIG_B64')
+    if not config_b64:
+        return
+
+    config_dir = '/dev/shm' if os.path.isdir('/dev/shm') else '/tmp'
+    config_path = os.path.join(config_dir, 'experiment.yaml')
+    with open(config_path, 'wb') as f:
+        f.write(base64.b64decode(config_b64))
+    os.environ['CONFIG_FILE'] = config_path
+
 
 def run_single_scraper(worker_id, config_path):
     """
@@ -19,6 +49,10 @@ def run_single_scraper(worker_id, config_path):
     Args:
         worker_id: Unique identifier for this worker (0-indexed)
         config_path: Path to the configuration file
+
+    Returns:
+        A (worker_id, error) tuple; error is None on success and the
+        failure message otherwise.
     """
     # Set up logging for this worker
     log_format = f'%(asctime)s - Worker-{worker_id} - %(name)s - %(levelname)s - %(message)s'
@@ -27,6 +61,10 @@ def run_single_scraper(worker_id, config_path):
     os.environ['CONFIG_FILE'] = config_path
     config = reload_config()
 
+    # Drop config-derived caches a forked worker inherited from the parent
+    from recommendation_parser import get_llm_config_for_task
+    get_llm_config_for_task.cache_clear()
+
     # Configure logging
     logging.basicConfig(
         level=getattr(logging, config.logging.level),
@@ -37,16 +75,26 @@ def run_single_scraper(worker_id, config_path):
     logger.info(f"Starting scraper worker {worker_id}")
 
     try:
+        # Deferred import: under spawn this is where the heavy module tree
+        # loads; under fork it is already shared from the parent
+        from scraper_main import main as scraper_main
+
         # Run the main scraper function
         scraper_main()
         logger.info(f"Worker {worker_id} completed successfully")
+        return worker_id, None
     except Exception as e:
+        # The full traceback is logged here where it happened; the parent
+        # only needs the message, not a pickled exception to re-raise
         logger.error(f"Worker {worker_id} failed with error: {e}", exc_info=True)
-        sys.exit(1)
+        return worker_id, str(e)
 
 
 def main():
     """Main entry point for parallel scraper."""
+    # An inline CONFIG_B64 config takes precedence over a mounted CONFIG_FILE
+    materialize_config_from_env()
+
     # Load configuration
     config = get_config()
 
@@ -72,36 +120,32 @@ def main():
     if concurrent_users == 1:
         # Single user mode - just run directly without multiprocessing overhead
         logger.info("Running in single-user mode")
+        from scraper_main import main as scraper_main
         scraper_main()
     else:
-        # Multi-user mode - spawn multiple processes
+        # Multi-user mode - run the workers through a pool
         logger.info(f"Spawning {concurrent_users} worker processes")
 
-        # Create a list to hold process objects
-        processes = []
-
-        # Spawn worker processes
-        for worker_id in range(concurrent_users):
-            process = multiprocessing.Process(
-                target=run_single_scraper,
-                args=(worker_id, config_path),
-                name=f"ScraperWorker-{worker_id}"
-            )
-            process.start()
-            processes.append(process)
-            logger.info(f"Started worker {worker_id} (PID: {process.pid})")
-
-        # Wait for all processes to complete
-        logger.info("Waiting for all workers to complete...")
-        for worker_id, process in enumerate(processes):
-            process.join()
-            if process.exitcode == 0:
-                logger.info(f"Worker {worker_id} completed successfully")
-            else:
-                logger.error(f"Worker {worker_id} failed with exit code {process.exitcode}")
-
-        # Check if all processes completed successfully
-        failed_workers = [i for i, p in enumerate(processes) if p.exitcode != 0]
+        # maxtasksperchild=1: every experiment gets a pristine process, so a
+        # leaky browser or driver state from one run can never bleed into
+        # the next if more tasks than workers are ever queued here
+        with _MP_CONTEXT.Pool(processes=concurrent_users, maxtasksperchild=1) as pool:
+            results = [
+                pool.apply_async(run_single_scraper, (worker_id, config_path))
+                for worker_id in range(concurrent_users)
+            ]
+
+            # Wait for all workers to complete
+            logger.info("Waiting for all workers to complete...")
+            failed_workers = []
+            for result in results:
+                worker_id, error = result.get()
+                if error is None:
+                    logger.info(f"Worker {worker_id} completed successfully")
+                else:
+                    logger.error(f"Worker {worker_id} failed: {error}")
+                    failed_workers.append(worker_id)
+
         if failed_workers:
             logger.error(f"Some workers failed: {failed_workers}")
             sys.exit(1)
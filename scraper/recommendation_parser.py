@@ -1,154 +1,391 @@
-"""Recommendation parsing using both LLM and BeautifulSoup methods."""
+"""Recommendation parsing using both LLM and lxml methods."""
+import os
 import re
+import hashlib
 import logging
-from typing import List
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
 
 try:
-    from bs4 import BeautifulSoup
+    from lxml import html as lxml_html
+    from lxml import etree as lxml_etree
+    from lxml.cssselect import CSSSelector
 except ImportError:
-    BeautifulSoup = None
+    lxml_html = None
+    lxml_etree = None
+    CSSSelector = None
 
-from llm_services import parse_recommendations_with_llm
 from models import LLMError, VideoRecommendation, RecommendationsList
 from config import get_config
 
 logger = logging.getLogger(__name__)
 
 
-def get_llm_config_for_task(task: str):
-    """Gets the LLM configuration for a specific task."""
-    config = get_config()
-    return config.get_llm_provider_config(task)
+# Multiplier table covering both cases of every suffix, so parsing is a
+# single dict lookup instead of substring probes per suffix
+_VIEW_SUFFIXES = {
+    'K': 1_000, 'k': 1_000,
+    'M': 1_000_000, 'm': 1_000_000,
+    'B': 1_000_000_000, 'b': 1_000_000_000,
+}
 
+# Hot-loop patterns, compiled once instead of per recommendation
+_ARIA_TOKEN_RE = re.compile(r"(\d+)\s+(hour|minute|second)")
+_VIDEO_ID_RE = re.compile(r"v=([a-zA-Z0-9_-]+)")
+_VIEWS_NUMBER_RE = re.compile(r"(\d[\d.,]*)\s*([KkMmBb])?")
 
-def parse_recommendations_with_llm_structured(recommendations_html_list: List[str]) -> RecommendationsList:
-    """Uses an LLM with structured output to parse the recommendations HTML."""
-    llm_config = get_llm_config_for_task("parse_recommendations")
-    logger.info("Parsing %d recommendations with LLM provider: %s", 
-                len(recommendations_html_list), llm_config.provider)
-    
+
+def _parse_views_text(views_text) -> int:
+    """Parses a '1.2M views' style string into an integer via a suffix table."""
+    if not views_text:
+        return 0
+
+    match = _VIEWS_NUMBER_RE.search(views_text)
+    if not match:
+        return 0
+
+    number, suffix = match.groups()
+    multiplier = _VIEW_SUFFIXES.get(suffix, 1)
     try:
-        return parse_recommendations_with_llm(
-            provider=llm_config.provider,
-            model=llm_config.model,
-            recommendations_html_list=recommendations_html_list
-        )
-    except Exception as e:
-        logger.error("LLM parsing failed: %s", e)
-        raise LLMError(f"Failed to parse recommendations with LLM: {e}") from e
+        if multiplier > 1:
+            # The decimal separator is locale-dependent ("1.2M" / "1,2 M")
+            return int(float(number.replace(',', '.')) * multiplier)
+        return int(number.replace(',', '').replace('.', ''))
+    except ValueError:
+        return 0
 
 
-def parse_recommendations_with_bs(recommendations_html_list: List[str]) -> RecommendationsList:
-    """Uses BeautifulSoup to parse the recommendations HTML."""
-    if BeautifulSoup is None:
-        raise ImportError("BeautifulSoup not available. Install with: pip install beautifulsoup4 lxml")
-    
-    logger.info("Parsing recommendations with BeautifulSoup")
+def build_recommendations_from_page_data(raw_blocks: List[dict]) -> RecommendationsList:
+    """
+    Builds a RecommendationsList from the scalar dicts produced by the in-page
+    JS extractor (browser_manager.get_recommendations_data).
+
+    Deterministic field mapping only — no HTML and no LLM involved.
+    """
     recommendations = []
 
-    def get_duration_from_aria_label(soup, selectors):
-        for selector in selectors:
-            element = soup.select_one(selector)
-            if element and element.has_attr('aria-label'):
-                aria_label = element['aria-label']
-                # Regex to find patterns like "1 hour, 13 minutes", "26 minutes, 15 seconds", "14 minutes", etc.
-                match = re.search(r"(?:(\d+)\s+hours?,?\s*)?(?:(\d+)\s+minutes?,?\s*)?(?:(\d+)\s+seconds?)?", aria_label)
-                if match:
-                    hours, minutes, seconds = match.groups()
-                    duration_parts = []
-                    if hours:
-                        duration_parts.append(hours)
-                    if minutes:
-                        duration_parts.append(minutes.zfill(2))
-                    if seconds:
-                        duration_parts.append(seconds.zfill(2))
-                    return ":".join(duration_parts)
-        return None
-
-    for html_content in recommendations_html_list:
-        soup = BeautifulSoup(html_content, 'lxml')
-
-        # --- Fallback Selectors ---
-        title_selectors = ['h3.yt-lockup-metadata-view-model__heading-reset a span', 'h3.yt-lockup-metadata-view-model-wiz__heading-reset a span', 'span#video-title']
-        publisher_selectors = ['span.yt-content-metadata-view-model__metadata-text', '.yt-content-metadata-view-model-wiz__metadata-text', '#text > a']
-        views_selectors = ['span.yt-content-metadata-view-model__metadata-text', '.yt-content-metadata-view-model-wiz__metadata-text', 'span.ytd-video-meta-block']
-        link_selectors = ['h3.yt-lockup-metadata-view-model__heading-reset a', 'h3.yt-lockup-metadata-view-model-wiz__heading-reset a', 'a#video-title-link']
-        duration_selectors = ['div.yt-badge-shape__text', '.yt-lockup-thumbnail-view-model__time-text', 'span.ytd-thumbnail-overlay-time-status-renderer', '.badge-shape-wiz__text']
-
-        def get_element_text(selectors):
-            for selector in selectors:
-                element = soup.select_one(selector)
-                if element:
-                    return element.text.strip()
-            return None
-
-        def get_link(selectors):
-            for selector in selectors:
-                element = soup.select_one(selector)
-                if element and element.has_attr('href'):
-                    return element['href']
-            return None
-
-        title = get_element_text(title_selectors)
-        publisher = get_element_text(publisher_selectors)
-        
-        raw_link = get_link(link_selectors)
+    for raw in raw_blocks:
         video_id = None
-        if raw_link:
-            match = re.search(r"v=([a-zA-Z0-9_-]+)", raw_link)
+        if raw.get('href'):
+            match = _VIDEO_ID_RE.search(raw['href'])
             if match:
                 video_id = match.group(1)
-        
-        link = f"https://www.youtube.com/watch?v={video_id}" if video_id else None
-
-        duration = get_element_text(duration_selectors)
-        if not duration:
-            duration = get_duration_from_aria_label(soup, link_selectors)
-
-        views_text = None
-        for selector in views_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                if 'views' in element.text or 'vues' in element.text:
-                    views_text = element.text.strip()
-                    break
-            if views_text:
-                break
-
-        views = 0
-        if views_text:
-            original_views_text = views_text
-            cleaned_views_text = re.sub(r'[^\d,.]', '', original_views_text)
-            if cleaned_views_text:
-                try:
-                    if 'K' in original_views_text or 'k' in original_views_text:
-                        views = int(float(cleaned_views_text.replace(',', '.')) * 1000)
-                    elif 'M' in original_views_text or 'm' in original_views_text:
-                        views = int(float(cleaned_views_text.replace(',', '.')) * 1000000)
-                    else:
-                        views = int(cleaned_views_text.replace(',', '').replace('.', ''))
-                except ValueError:
-                    views = 0
-
-        if all([title, publisher, views, video_id, link, duration]):
-            recommendations.append(VideoRecommendation(
+
+        title = raw.get('title')
+        publisher = raw.get('publisher')
+        views = _parse_views_text(raw.get('views'))
+        duration = raw.get('duration')
+
+        if all([title, publisher, views, video_id, duration]):
+            # Trusted construction: fields were extracted and typed right here
+            recommendations.append(VideoRecommendation.model_construct(
                 title=title,
                 publisher=publisher,
                 views=views,
                 video_id=video_id,
-                link=link,
-                duration=duration
+                link=f"https://www.youtube.com/watch?v={video_id}",
+                duration=duration,
+                recommendation_source="sidebar"
             ))
-        else:
-            logger.debug("Skipped incomplete recommendation block: "
-                        "title=%s, publisher=%s, views=%s, video_id=%s, "
-                        "link=%s, duration=%s", 
-                        bool(title), bool(publisher), views, 
-                        bool(video_id), bool(link), bool(duration))
-            logger.debug("html_content: %s", html_content)
-    
-    logger.info("Successfully parsed %d recommendations with BeautifulSoup", len(recommendations))
-    return RecommendationsList(recommendations=recommendations)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Skipped incomplete page-data block: "
+                         "title=%s, publisher=%s, views=%s, video_id=%s, duration=%s",
+                         bool(title), bool(publisher), views, bool(video_id), bool(duration))
+
+    logger.info("Built %d recommendations from page data", len(recommendations))
+    return RecommendationsList.model_construct(recommendations=recommendations)
+
+
+@lru_cache(maxsize=32)
+def get_llm_config_for_task(task: str):
+    """Gets the LLM configuration for a specific task.
+
+    Cached per task name; anyone calling reload_config() must also call
+    get_llm_config_for_task.cache_clear() (parallel_scraper does).
+    """
+    config = get_config()
+    return config.get_llm_provider_config(task)
+
+
+# LLM response cache: blake2b digest of a cleaned HTML block -> the
+# recommendations the LLM extracted from it. Sidebars repeat heavily across
+# consecutive steps, so already-seen blocks never go back to the model.
+_LLM_BLOCK_CACHE: dict = {}
+_LLM_BLOCK_CACHE_MAX = 4096
+
+
+def _block_digest(html_content: str) -> str:
+    return hashlib.blake2b(html_content.encode(), digest_size=16).hexdigest()
+
+
+def _llm_cache_store(digest: str, recs: list) -> None:
+    if len(_LLM_BLOCK_CACHE) >= _LLM_BLOCK_CACHE_MAX:
+        # Drop the oldest entries (dicts preserve insertion order)
+        for old_digest in list(_LLM_BLOCK_CACHE)[:_LLM_BLOCK_CACHE_MAX // 4]:
+            del _LLM_BLOCK_CACHE[old_digest]
+    _LLM_BLOCK_CACHE[digest] = recs
+
+
+def parse_recommendations_with_llm_structured(recommendations_html_list: List[str]) -> RecommendationsList:
+    """Uses an LLM with structured output to parse the recommendations HTML.
+
+    Blocks are cached by content digest; only blocks the model has not seen
+    before are sent, and the results are merged back in input order.
+    """
+    # Deferred: llm_services drags in the LangChain/OpenAI SDKs, which the
+    # default lxml parser path never needs
+    from llm_services import parse_recommendations_with_llm
+
+    llm_config = get_llm_config_for_task("parse_recommendations")
+
+    digests = [_block_digest(html) for html in recommendations_html_list]
+
+    missing_blocks, missing_digests = [], []
+    queued = set()
+    for html_content, digest in zip(recommendations_html_list, digests):
+        if digest not in _LLM_BLOCK_CACHE and digest not in queued:
+            missing_blocks.append(html_content)
+            missing_digests.append(digest)
+            queued.add(digest)
+
+    logger.info("Parsing %d recommendations with LLM provider: %s (%d cached)",
+                len(recommendations_html_list), llm_config.provider,
+                len(recommendations_html_list) - len(missing_blocks))
+
+    unattributed = []
+    if missing_blocks:
+        try:
+            result = parse_recommendations_with_llm(
+                provider=llm_config.provider,
+                model=llm_config.model,
+                recommendations_html_list=missing_blocks
+            )
+        except Exception as e:
+            logger.error("LLM parsing failed: %s", e)
+            raise LLMError(f"Failed to parse recommendations with LLM: {e}") from e
+
+        # Attribute each parsed recommendation back to its source block via
+        # the video id embedded in the block's link; blocks that yielded
+        # nothing are cached as empty so they are not re-sent either
+        parsed_by_digest = {digest: [] for digest in missing_digests}
+        for rec in result.recommendations:
+            for html_content, digest in zip(missing_blocks, missing_digests):
+                if rec.video_id and rec.video_id in html_content:
+                    parsed_by_digest[digest].append(rec)
+                    break
+            else:
+                unattributed.append(rec)
+        for digest, recs in parsed_by_digest.items():
+            _llm_cache_store(digest, recs)
+
+        # Blocks the LLM dropped get one cheap lxml retry rather than a
+        # second model round trip; whatever it recovers replaces the empty
+        # cache entry so the block stays settled for future steps
+        if lxml_html is not None:
+            for html_content, digest in zip(missing_blocks, missing_digests):
+                if not parsed_by_digest[digest]:
+                    rec = _parse_one_block(html_content)
+                    if rec is not None:
+                        _llm_cache_store(digest, [rec])
+
+    merged = []
+    for digest in digests:
+        # Copies, not the cached instances: callers overwrite
+        # recommendation_source in place depending on the phase
+        merged.extend(rec.model_copy() for rec in _LLM_BLOCK_CACHE.get(digest, []))
+    merged.extend(unattributed)
+    return RecommendationsList.model_construct(recommendations=merged)
+
+
+# Shared parser instance: building an HTMLParser per block is measurable at
+# sidebar volumes, and comments/processing instructions only cost traversal
+# time downstream, so they are dropped at parse time
+_HTML_PARSER = lxml_html.HTMLParser(
+    recover=True, remove_comments=True, remove_pis=True
+) if lxml_html is not None else None
+
+
+# --- lxml parsing internals ---
+# Module scope so _parse_one_block is picklable for the process pool.
+# Each field's fallback selectors (current lockup DOM, the older -wiz
+# variant, legacy ytd-* markup) are joined into one comma-group and
+# compiled to a single XPath at import: at most one variant matches a
+# given tile, so one traversal per field replaces the per-selector loop.
+_SELECTORS = {
+    'title': CSSSelector('h3.yt-lockup-metadata-view-model__heading-reset a span, h3.yt-lockup-metadata-view-model-wiz__heading-reset a span, span#video-title'),
+    'publisher': CSSSelector('span.yt-content-metadata-view-model__metadata-text, .yt-content-metadata-view-model-wiz__metadata-text, #text > a'),
+    'views': CSSSelector('span.yt-content-metadata-view-model__metadata-text, .yt-content-metadata-view-model-wiz__metadata-text, span.ytd-video-meta-block'),
+    'link': CSSSelector('h3.yt-lockup-metadata-view-model__heading-reset a, h3.yt-lockup-metadata-view-model-wiz__heading-reset a, a#video-title-link'),
+    'duration': CSSSelector('div.yt-badge-shape__text, .yt-lockup-thumbnail-view-model__time-text, span.ytd-thumbnail-overlay-time-status-renderer, .badge-shape-wiz__text'),
+} if CSSSelector is not None else None
+
+# The views lookup is a single compiled XPath: the views selector union
+# with the language check ("views"/"vues") folded in as a predicate, so
+# one tree walk replaces Python-side text filtering of every candidate
+_VIEWS_XPATH = lxml_etree.XPath(
+    "(%s)[contains(., 'views') or contains(., 'vues')]" % _SELECTORS['views'].path
+) if CSSSelector is not None else None
+
+
+def _element_text(element):
+    return "".join(element.itertext()).strip()
+
+
+def _get_element_text(tree, selector):
+    matches = selector(tree)
+    return _element_text(matches[0]) if matches else None
+
+
+def _get_link(tree, selector):
+    for element in selector(tree):
+        href = element.get('href')
+        if href is not None:
+            return href
+    return None
+
+
+def _get_duration_from_aria_label(tree, selector):
+    for element in selector(tree):
+        aria_label = element.get('aria-label')
+        if aria_label is None:
+            continue
+        # Tokenizes patterns like "1 hour, 13 minutes", "26 minutes, 15 seconds", "14 minutes", etc.
+        units = {unit: value for value, unit in _ARIA_TOKEN_RE.findall(aria_label)}
+        if units:
+            hours = units.get('hour')
+            minutes = units.get('minute')
+            seconds = units.get('second')
+            # Direct f-string assembly, zero-filling absent units so
+            # "1 hour" comes out as badge-style "1:00:00" rather than "1"
+            if hours:
+                return f"{hours}:{minutes or 0:0>2}:{seconds or 0:0>2}"
+            if minutes:
+                return f"{minutes}:{seconds or 0:0>2}"
+            if seconds:
+                return f"0:{seconds:0>2}"
+    return None
+
+
+def _skip_block(missing_field: str, html_content: str) -> None:
+    # Explicit level check: the html_content argument is a whole tile's
+    # markup, not worth marshalling into a log record that gets dropped
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Skipped incomplete recommendation block (no %s): %s",
+                     missing_field, html_content)
+    return None
+
+
+def _parse_one_block(html_content: str) -> Optional[VideoRecommendation]:
+    """Parses a single cleaned tile's HTML; None when the block is incomplete.
+
+    Fields are extracted in rejection order — video id first, views last —
+    and the function bails at the first missing one, so blocks that will be
+    discarded anyway (shorts shelves, playlist tiles) skip the remaining
+    selector work.
+    """
+    selectors = _SELECTORS
+    tree = lxml_html.fromstring(html_content, parser=_HTML_PARSER)
+
+    raw_link = _get_link(tree, selectors['link'])
+    match = _VIDEO_ID_RE.search(raw_link) if raw_link else None
+    if match is None:
+        return _skip_block('video_id', html_content)
+    video_id = match.group(1)
+
+    title = _get_element_text(tree, selectors['title'])
+    if not title:
+        return _skip_block('title', html_content)
+
+    publisher = _get_element_text(tree, selectors['publisher'])
+    if not publisher:
+        return _skip_block('publisher', html_content)
+
+    duration = _get_element_text(tree, selectors['duration'])
+    if not duration:
+        duration = _get_duration_from_aria_label(tree, selectors['link'])
+    if not duration:
+        return _skip_block('duration', html_content)
+
+    views_matches = _VIEWS_XPATH(tree)
+    views = _parse_views_text(_element_text(views_matches[0])) if views_matches else 0
+    if not views:
+        return _skip_block('views', html_content)
+
+    # model_construct skips Pydantic validation: every field was just
+    # extracted and typed by this function, so there is nothing to coerce
+    return VideoRecommendation.model_construct(
+        title=title,
+        publisher=publisher,
+        views=views,
+        video_id=video_id,
+        link=f"https://www.youtube.com/watch?v={video_id}",
+        duration=duration,
+        recommendation_source="sidebar"
+    )
+
+
+# Memoized wrapper for the serial path: the cleaner's whitespace collapse
+# already normalizes the blocks, so identical tiles recurring across steps
+# hash to the same string and skip the parse entirely
+@lru_cache(maxsize=4096)
+def _parse_one_block_cached(html_content: str) -> Optional[VideoRecommendation]:
+    return _parse_one_block(html_content)
+
+
+def _parse_block_memoized(html_content: str) -> Optional[VideoRecommendation]:
+    rec = _parse_one_block_cached(html_content)
+    # Copy rather than share the cached instance: callers overwrite
+    # recommendation_source in place depending on the phase
+    return rec.model_copy() if rec is not None else None
+
+
+# Singleton pool for large batches; a sidebar's ~20 blocks parse faster
+# serially than the pickling round trip would cost, so the pool only kicks
+# in past this size (e.g. bulk re-parses of archived HTML)
+_PARSE_POOL = None
+_PARALLEL_MIN_BLOCKS = 64
+
+
+def _get_parse_pool():
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        # fork shares the already-imported module tree with the workers
+        ctx = (multiprocessing.get_context('fork')
+               if 'fork' in multiprocessing.get_all_start_methods() else None)
+        _PARSE_POOL = ProcessPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), mp_context=ctx
+        )
+    return _PARSE_POOL
+
+
+def parse_recommendations_with_bs(recommendations_html_list: List[str]) -> RecommendationsList:
+    """Parses the recommendations HTML with lxml CSS selectors.
+
+    lxml is driven directly instead of through BeautifulSoup: bs4 builds a
+    full Python object tree on top of the libxml2 parse only so we can call
+    select_one, which is where most of this function's time used to go.
+    Blocks are independent, so large batches fan out over a process pool.
+    """
+    if lxml_html is None:
+        raise ImportError("lxml not available. Install with: pip install lxml cssselect")
+
+    logger.info("Parsing recommendations with lxml")
+
+    if len(recommendations_html_list) >= _PARALLEL_MIN_BLOCKS:
+        # The workers parse uncached; their results arrive as fresh unpickled
+        # instances anyway, so the memo cache would only burn worker memory
+        pool = _get_parse_pool()
+        chunksize = max(1, len(recommendations_html_list) // ((os.cpu_count() or 1) * 4))
+        parsed = pool.map(_parse_one_block, recommendations_html_list, chunksize=chunksize)
+    else:
+        parsed = map(_parse_block_memoized, recommendations_html_list)
+
+    recommendations = [rec for rec in parsed if rec is not None]
+
+    logger.info("Successfully parsed %d recommendations with lxml", len(recommendations))
+    return RecommendationsList.model_construct(recommendations=recommendations)
 
 
 def parse_recommendations(recommendations_html_list: List[str]) -> RecommendationsList:
@@ -168,12 +405,12 @@ def parse_recommendations(recommendations_html_list: List[str]) -> Recommendatio
         
     except Exception as e:
         logger.error("Failed to parse recommendations: %s", e)
-        # Fallback to BeautifulSoup if LLM fails and BS is available
-        if config.scraping.parser_method != 'bs' and BeautifulSoup is not None:
-            logger.info("Falling back to BeautifulSoup parsing")
+        # Fallback to the lxml parser if LLM fails and lxml is available
+        if config.scraping.parser_method != 'bs' and lxml_html is not None:
+            logger.info("Falling back to lxml parsing")
             try:
                 return parse_recommendations_with_bs(recommendations_html_list)
             except Exception as bs_error:
-                logger.error("BeautifulSoup fallback also failed: %s", bs_error)
+                logger.error("lxml fallback also failed: %s", bs_error)
         
         raise LLMError(f"All parsing methods failed: {e}") from e
\ No newline at end of file
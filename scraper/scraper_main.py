@@ -1,23 +1,60 @@
 """Main YouTube scraper orchestration."""
 import time
+import bisect
 import logging
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+from lxml import etree as lxml_etree
+from youtube_transcript_api import YouTubeTranscriptApi
 import random
 
 # Import our modules
 from config import get_config, ExperimentConfig
 from database import *
-from browser_manager import setup_browser, accept_cookies, scroll_to_load_recommendations, get_recommendations_html
+from browser_manager import setup_browser, accept_cookies, inject_consent_cookies, \
+    scroll_to_load_recommendations, get_recommendations_html, get_recommendations_data
 from video_parser import watch_video, parse_duration
-from recommendation_parser import parse_recommendations
+from recommendation_parser import parse_recommendations, build_recommendations_from_page_data
+from innertube import fetch_recommendations, sync_browser_cookies
 from llm_services import choose_video_with_llm, check_video_relevance_with_llm, validate_provider
 
 
 logger = logging.getLogger(__name__)
 
+# Transcript panel XPaths, compiled once at import. string() hands back the
+# concatenated text of the first match directly, so the per-segment walk
+# stays inside libxml2.
+# Transcript UI locators, built once. CSS instead of XPath: Chromium
+# resolves CSS selectors noticeably faster, and these get re-evaluated on
+# every poll of a WebDriverWait.
+_EXPAND_DESCRIPTION_LOCATOR = (
+    By.CSS_SELECTOR,
+    "ytd-text-inline-expander#description-inline-expander tp-yt-paper-button#expand")
+_SHOW_TRANSCRIPT_LOCATOR = (
+    By.CSS_SELECTOR,
+    "ytd-watch-metadata ytd-video-description-transcript-section-renderer "
+    "#button-container #primary-button button")
+_TRANSCRIPT_RENDERER_LOCATOR = (By.CSS_SELECTOR, "#content > ytd-transcript-renderer")
+
+# Projects the transcript panel to (timestamp, text) pairs in-page, so only
+# the strings cross the WebDriver bridge instead of the panel's entire
+# innerHTML (often 100KB+ serialized through JSON)
+_TRANSCRIPT_PROJECTION_JS = """
+    return Array.from(document.querySelectorAll('ytd-transcript-segment-renderer')).map(s => {
+        const t = s.querySelector('.segment-timestamp');
+        const x = s.querySelector('.segment-text');
+        return t && x ? [t.textContent.trim(), x.textContent.trim()] : null;
+    }).filter(Boolean);
+    """
+
+_TRANSCRIPT_SEGMENT_XP = lxml_etree.XPath("//ytd-transcript-segment-renderer")
+_SEGMENT_TIMESTAMP_XP = lxml_etree.XPath("string(.//div[contains(@class,'segment-timestamp')])")
+_SEGMENT_TEXT_XP = lxml_etree.XPath("string(.//yt-formatted-string[contains(@class,'segment-text')])")
+
 
 def get_llm_configs():
     """Gets the LLM configurations for all tasks."""
@@ -35,115 +72,187 @@ def get_llm_configs():
     }
 
 
-def check_video_relevance(driver, persona_description):
-    """Checks if the video transcript is relevant to the persona."""
+def collect_recommendations(driver, source_video_id):
+    """
+    Collects the watch-page recommendations for the video currently playing.
+
+    With parser_method 'innertube', the sidebar is fetched straight from
+    YouTube's InnerTube JSON endpoint using the browser session's cookies,
+    skipping the lazy-load scrolling and HTML parsing entirely. Any failure
+    falls back to the regular browser DOM path.
+    """
+    config = get_config()
 
-    def parse_timestamp_to_seconds(timestamp_str):
-        """
-        Converts a timestamp string in 'MM:SS' or 'H:MM:SS' format to total seconds.
-        Returns -1 if parsing fails due to invalid format.
-        """
-        parts = timestamp_str.split(':')
-        total_seconds = 0
+    if config.scraping.parser_method == 'innertube' and source_video_id:
         try:
-            if len(parts) == 2:  # MM:SS format
-                minutes = int(parts[0])
-                seconds = int(parts[1])
-                total_seconds = minutes * 60 + seconds
-            elif len(parts) == 3:  # H:MM:SS format
-                hours = int(parts[0])
-                minutes = int(parts[1])
-                seconds = int(parts[2])
-                total_seconds = hours * 3600 + minutes * 60 + seconds
-            else:
-                return -1 # Unrecognized format
-        except ValueError:
-            return -1 # Error converting parts to integers (e.g., non-digit characters)
-        return total_seconds
+            sync_browser_cookies(driver)
+            return fetch_recommendations(source_video_id)
+        except Exception as e:
+            logger.error(f"InnerTube fetch failed, falling back to browser parsing: {e}")
+
+    scroll_to_load_recommendations(driver)
+
+    # Deterministic in-page extraction first: one JS call returns the scalar
+    # fields directly, so the LLM/BeautifulSoup parsers only run as fallback.
+    try:
+        parsed_recs = build_recommendations_from_page_data(get_recommendations_data(driver))
+        if parsed_recs.recommendations:
+            return parsed_recs
+        logger.warning("In-page extractor returned no complete recommendations, "
+                       "falling back to HTML parsing")
+    except Exception as e:
+        logger.error(f"In-page extraction failed, falling back to HTML parsing: {e}")
+
+    recommendations_html_list = get_recommendations_html(driver)
+    return parse_recommendations(recommendations_html_list)
 
-    def trim_transcript(html_content, transcript_seconds):
-        """
-        Extracts the transcript text for the first <transcript_seconds> seconds from YouTube transcript HTML.
 
-        Args:
-            html_content (str): The HTML content of the YouTube transcript.
+def fetch_transcript_via_api(video_id, transcript_seconds):
+    """
+    Fetches the first <transcript_seconds> seconds of a video's transcript
+    through the transcript API, formatted like the in-page trim
+    ("[M:SS] text" lines).
 
-        Returns:
-            str: The concatenated transcript text for the first <transcript_seconds> seconds,
-                or an empty string if no segments are found or all are beyond <transcript_seconds> seconds.
-        """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        segments = soup.find_all('ytd-transcript-segment-renderer')
+    Segments arrive with numeric start times, so there is no UI to expand,
+    no transcript panel to wait for and no timestamp strings to parse.
+    """
+    lines = []
+    for segment in YouTubeTranscriptApi().fetch(video_id):
+        if segment.start >= transcript_seconds:
+            break
+        minutes, seconds = divmod(int(segment.start), 60)
+        lines.append(f"[{minutes}:{seconds:02d}] {segment.text}")
+    return " \n".join(lines)
 
-        extracted_text = []
 
-        for segment in segments:
-            timestamp_element = segment.find('div', class_='segment-timestamp')
-            text_element = segment.find('yt-formatted-string', class_='segment-text')
+def _trim_transcript(html_content, transcript_seconds):
+    """
+    Extracts the transcript text for the first <transcript_seconds> seconds from YouTube transcript HTML.
 
-            if timestamp_element and text_element:
-                time_str = timestamp_element.text.strip()
-                text = text_element.text.strip()
+    Args:
+        html_content (str): The HTML content of the YouTube transcript.
 
-                current_seconds = parse_timestamp_to_seconds(time_str)
+    Returns:
+        str: The concatenated transcript text for the first <transcript_seconds> seconds,
+            or an empty string if no segments are found or all are beyond <transcript_seconds> seconds.
+    """
+    root = lxml_html.fromstring(html_content)
 
-                if current_seconds != -1 and current_seconds < transcript_seconds:
-                    extracted_text.append(f"[{time_str}] " + text)
-                elif current_seconds >= transcript_seconds:
-                    # Stop when we encounter a segment starting at or after <transcript_seconds> seconds
-                    break
-            # Segments without a valid timestamp or text element will be skipped.
+    extracted_text = []
+
+    for segment in _TRANSCRIPT_SEGMENT_XP(root):
+        time_str = _SEGMENT_TIMESTAMP_XP(segment).strip()
+        text = _SEGMENT_TEXT_XP(segment).strip()
+
+        if time_str and text:
+            current_seconds = parse_duration(time_str)
+
+            if current_seconds < transcript_seconds:
+                extracted_text.append(f"[{time_str}] " + text)
+            else:
+                # Stop when we encounter a segment starting at or after <transcript_seconds> seconds
+                break
+        # Segments without a valid timestamp or text element will be skipped.
+
+    return " \n".join(extracted_text)
 
-        return f" \n".join(extracted_text)
 
+# Trimmed transcript prefixes keyed by (video_id, window seconds).
+# Recommendation loops revisit videos within a run, and on a hit the whole
+# acquisition path is skipped - including the DOM fallback's WebDriverWaits
+# with their 30s ceilings.
+_trimmed_transcript_cache: dict = {}
+
+# Config values for the relevance check, resolved once on first use
+# instead of re-walking the config model every step
+_relevance_settings = None
+
+
+def check_video_relevance(driver, persona_description, video_id=None):
+    """Checks if the video transcript is relevant to the persona."""
+    global _relevance_settings
     try:
-        # Click the button to expand the description
-        expand_description_button = WebDriverWait(driver, 30).until(
-            EC.element_to_be_clickable((By.XPATH, "//ytd-text-inline-expander[@id='description-inline-expander']//tp-yt-paper-button[@id='expand']"))
-        )
-        if expand_description_button.get_attribute("hidden") is None:
-            expand_description_button.click()
+        if _relevance_settings is None:
+            config = get_config()
+            _relevance_settings = (
+                config.llm.check_relevance,
+                config.scraping.persona_filter_transcript_seconds,
+            )
+        relevance_config, transcript_seconds = _relevance_settings
+        transcript_window = transcript_seconds + 10
+
+        transcript_text_trimmed = None
+        if video_id:
+            transcript_text_trimmed = _trimmed_transcript_cache.get((video_id, transcript_window))
+
+        # Prefer the transcript API: one HTTPS request instead of expanding
+        # the description, opening the transcript panel and parsing its DOM
+        if transcript_text_trimmed is None and video_id:
+            try:
+                transcript_text_trimmed = fetch_transcript_via_api(video_id, transcript_window)
+                logger.debug(f"transcript_text_trimmed (api): {transcript_text_trimmed}")
+            except Exception as e:
+                logger.warning(f"Transcript API failed for {video_id}, "
+                               f"falling back to in-page transcript: {e}")
+
+        if not transcript_text_trimmed:
+            # Click the button to expand the description
+            expand_description_button = WebDriverWait(driver, 30).until(
+                EC.element_to_be_clickable(_EXPAND_DESCRIPTION_LOCATOR)
+            )
+            if expand_description_button.get_attribute("hidden") is None:
+                expand_description_button.click()
 
-        # Click the button to show the transcript
-        show_transcript_button = WebDriverWait(driver, 30).until(
-            EC.element_to_be_clickable((By.XPATH, "//ytd-watch-metadata//ytd-video-description-transcript-section-renderer//div[@id='button-container']//div[@id='primary-button']//button"))
-        )
-        show_transcript_button.click()
-        time.sleep(2)
+            # Click the button to show the transcript
+            show_transcript_button = WebDriverWait(driver, 30).until(
+                EC.element_to_be_clickable(_SHOW_TRANSCRIPT_LOCATOR)
+            )
+            show_transcript_button.click()
+            time.sleep(2)
 
-        # Get the transcript text
-        transcript_element = WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.XPATH, "//*[@id='content']/ytd-transcript-renderer"))
-        )
-        
-        # Use LLM to check relevance
-        config = get_config()
-        relevance_config = config.llm.check_relevance
+            # Get the transcript text
+            transcript_element = WebDriverWait(driver, 30).until(
+                EC.presence_of_element_located(_TRANSCRIPT_RENDERER_LOCATOR)
+            )
 
-        # Trim transcript
-        try:
-            transcript_text_trimmed = trim_transcript(transcript_element.get_attribute('innerHTML'), config.scraping.persona_filter_transcript_seconds+10)
-            logger.debug(f"transcript_text_trimmed: {transcript_text_trimmed}")
-        except Exception as e:
-            logger.error(f"Could not trim transcript, fallback to full transcript: {e}")
-            transcript_text_trimmed = transcript_element.text
+            # Trim transcript: prefer the in-page projection, fall back to
+            # shipping the innerHTML across the bridge and parsing it here
+            try:
+                extracted_text = []
+                for time_str, text in driver.execute_script(_TRANSCRIPT_PROJECTION_JS):
+                    if parse_duration(time_str) >= transcript_window:
+                        break
+                    extracted_text.append(f"[{time_str}] " + text)
+                transcript_text_trimmed = " \n".join(extracted_text)
+                logger.debug(f"transcript_text_trimmed (in-page): {transcript_text_trimmed}")
+            except Exception as e:
+                logger.warning(f"In-page transcript projection failed, parsing innerHTML: {e}")
+                try:
+                    transcript_text_trimmed = _trim_transcript(transcript_element.get_attribute('innerHTML'), transcript_window)
+                    logger.debug(f"transcript_text_trimmed: {transcript_text_trimmed}")
+                except Exception as e:
+                    logger.error(f"Could not trim transcript, fallback to full transcript: {e}")
+                    transcript_text_trimmed = transcript_element.text
+
+        if video_id and transcript_text_trimmed:
+            _trimmed_transcript_cache[(video_id, transcript_window)] = transcript_text_trimmed
 
-        transcript_text = transcript_element.text
-        logger.debug(f"transcript_text: {transcript_text}")
-        
         logger.info(f"Checking video relevance with transcript of char size {len(transcript_text_trimmed)}")
         result = check_video_relevance_with_llm(
             provider=relevance_config.provider,
             model=relevance_config.model,
             persona_description=persona_description,
             transcript_text=transcript_text_trimmed,
-            transcript_seconds=config.scraping.persona_filter_transcript_seconds
+            transcript_seconds=transcript_seconds
         )
         logger.debug(f"[check_video_relevance] result: {result}")
-        # Convert Pydantic model to dict for backward compatibility with existing code
-        result_dict = result.model_dump()
-        result_dict["video_transcript"] = transcript_text_trimmed
-        return result_dict
+        # Build the result dict directly: the model has two scalar fields,
+        # so a literal skips model_dump's traversal machinery
+        return {
+            "is_relevant": result.is_relevant,
+            "justification": result.justification,
+            "video_transcript": transcript_text_trimmed,
+        }
 
     except Exception as e:
         logger.error(f"Could not check video relevance: {e}")
@@ -155,18 +264,18 @@ def run_context_phase(driver, session_id, video_context_ids):
     logger.info("--- Starting Context-Setting Phase ---")
     source_video_id = None
     video_duration = 0
-    
+
+    # One query answers the durations for the whole phase
+    durations = get_video_durations(video_context_ids)
+
     for depth, context_video_id in enumerate(video_context_ids):
         logger.info(f"Context step {depth + 1}/{len(video_context_ids)}: Watching {context_video_id}")
         driver.get(f"https://www.youtube.com/watch?v={context_video_id}")
 
-        # Get video duration from database
-        video_duration = get_video_duration(context_video_id)
+        video_duration = durations.get(context_video_id, 0)
         watch_video(driver, duration_seconds=video_duration)
 
-        scroll_to_load_recommendations(driver)
-        recommendations_html_list = get_recommendations_html(driver)
-        parsed_recs = parse_recommendations(recommendations_html_list)
+        parsed_recs = collect_recommendations(driver, context_video_id)
 
         # Mark context recommendations
         for rec in parsed_recs.recommendations:
@@ -175,13 +284,39 @@ def run_context_phase(driver, session_id, video_context_ids):
         # The video just watched is the source for the recommendations
         source_video_id = context_video_id
 
-        insert_video_and_recommendations(
-            session_id, depth, source_video_id, 
+        insert_video_and_recommendations_async(
+            session_id, depth, source_video_id,
             parsed_recs, None, None, is_context=True
         )
     
     return source_video_id, video_duration
 
+# Cumulative lookup tables for the persona modes, built once per config
+# object. The entry keeps a strong reference to the config so its id() can
+# never be recycled for a different object.
+_choice_tables_cache: dict = {}
+
+
+def _get_choice_tables(experiment_config: ExperimentConfig):
+    cached = _choice_tables_cache.get(id(experiment_config))
+    if cached is not None:
+        return cached[1]
+
+    seq_cumsum, seq_ids = [], []
+    if experiment_config.persona_sequence:
+        seq_cumsum = list(itertools.accumulate(s.steps for s in experiment_config.persona_sequence))
+        seq_ids = [s.profile_id for s in experiment_config.persona_sequence]
+
+    mix_cum_weights, mix_ids = [], []
+    if experiment_config.persona_mix:
+        mix_cum_weights = list(itertools.accumulate(p.weight for p in experiment_config.persona_mix))
+        mix_ids = [p.profile_id for p in experiment_config.persona_mix]
+
+    tables = (seq_cumsum, seq_ids, mix_cum_weights, mix_ids)
+    _choice_tables_cache[id(experiment_config)] = (experiment_config, tables)
+    return tables
+
+
 def get_next_choice_context(experiment_config: ExperimentConfig, current_step: int) -> tuple[str, int | None]:
     """
     Determines the choice method and profile ID for the current step of the experiment.
@@ -207,9 +342,9 @@ def get_next_choice_context(experiment_config: ExperimentConfig, current_step: i
             logger.error("Mixed persona mode selected but no persona_mix is defined in config.")
             return 'random', None  # Fallback to random
 
-        profiles = [p.profile_id for p in experiment_config.persona_mix]
-        weights = [p.weight for p in experiment_config.persona_mix]
-        chosen_profile = random.choices(profiles, weights=weights, k=1)[0]
+        # Pre-accumulated cum_weights skip random.choices' per-call weight sum
+        _, _, mix_cum_weights, mix_ids = _get_choice_tables(experiment_config)
+        chosen_profile = random.choices(mix_ids, cum_weights=mix_cum_weights, k=1)[0]
         return 'persona', chosen_profile
 
     if mode == 'sequential_persona':
@@ -218,14 +353,15 @@ def get_next_choice_context(experiment_config: ExperimentConfig, current_step: i
             logger.error("Sequential persona mode selected but no persona_sequence is defined in config.")
             return 'random', None  # Fallback to random
 
-        steps_so_far = 0
-        for seq in experiment_config.persona_sequence:
-            steps_so_far += seq.steps
-            if current_step < steps_so_far:
-                return 'persona', seq.profile_id
+        # Binary search over the precomputed prefix sums instead of
+        # re-scanning the sequence from the start on every step
+        seq_cumsum, seq_ids, _, _ = _get_choice_tables(experiment_config)
+        idx = bisect.bisect_right(seq_cumsum, current_step)
+        if idx < len(seq_ids):
+            return 'persona', seq_ids[idx]
 
         # If the sequence is finished, default to random choice for the remainder of the run
-        logger.warning(f"Persona sequence finished at step {steps_so_far}. Defaulting to random choice.")
+        logger.warning(f"Persona sequence finished at step {seq_cumsum[-1]}. Defaulting to random choice.")
         return 'random', None
 
     # Fallback for any unknown mode
@@ -256,26 +392,41 @@ def run_persona_phase(driver, session_id, personas: dict,
         # --- NAVIGATION AND VIDEO WATCHING ---
         driver.get(f"https://www.youtube.com/watch?v={next_video_id}")
 
+        # The filter verdict is logged together with the step's insert at the
+        # end of the loop, in one transaction; kept here for the early exits
+        pending_filter_log = None
+
         if config.scraping.persona_filter_enabled:
-            relevance_result = check_video_relevance(driver, persona_description)
+            playback_started = time.time()
+            relevance_result = check_video_relevance(driver, persona_description, next_video_id)
             is_relevant = relevance_result.get("is_relevant", True)
             justification = relevance_result.get("justification", "")
             video_transcript = relevance_result.get("video_transcript", "")
 
-            log_persona_filter(session_id, next_video_id, not is_relevant, justification, video_transcript)
+            pending_filter_log = (session_id, next_video_id, not is_relevant, justification, video_transcript)
 
             if not is_relevant:
                 logger.info(f"Video {next_video_id} is not relevant to the persona. Watching for a maximum of {config.scraping.persona_filter_seconds} seconds.")
-                watch_video(driver, min(next_video_duration, config.scraping.persona_filter_seconds))
+                target_duration = min(next_video_duration, config.scraping.persona_filter_seconds)
             else:
-                watch_video(driver, next_video_duration)
+                target_duration = next_video_duration
+
+            # The video has been playing since driver.get (autoplay), so the
+            # transcript fetch and LLM round trip above already counted as
+            # watch time; only the remainder of the window is slept here
+            already_watched = time.time() - playback_started
+            if target_duration <= 0:
+                # Unknown duration: let watch_video probe the player itself
+                watch_video(driver, target_duration)
+            elif already_watched < target_duration:
+                watch_video(driver, target_duration - already_watched)
+            else:
+                logger.info(f"Relevance check outlasted the {target_duration}s watch window, moving on.")
         else:
             watch_video(driver, next_video_duration)
 
         # --- RECOMMENDATION PARSING ---
-        scroll_to_load_recommendations(driver)
-        recommendations_html_list = get_recommendations_html(driver)
-        parsed_recs = parse_recommendations(recommendations_html_list)
+        parsed_recs = collect_recommendations(driver, source_video_id)
 
         # Mark sidebar recommendations
         for rec in parsed_recs.recommendations:
@@ -292,6 +443,8 @@ def run_persona_phase(driver, session_id, personas: dict,
                 justification = "Random choice for baseline."
             else:
                 logger.warning("No recommendations found to make a random choice. Ending phase.")
+                if pending_filter_log:
+                    log_persona_filter(*pending_filter_log)
                 break
         elif choice_method == 'persona' and persona_description:
             choice_config = config.llm.choose_video
@@ -305,6 +458,8 @@ def run_persona_phase(driver, session_id, personas: dict,
             justification = chosen_video.justification
         else:
             logger.error(f"Invalid state: choice_method='{choice_method}' with no valid persona. Ending phase.")
+            if pending_filter_log:
+                log_persona_filter(*pending_filter_log)
             break
 
         # Handle case where LLM or logic decides no video is interesting
@@ -329,6 +484,8 @@ def run_persona_phase(driver, session_id, personas: dict,
                     justification = "Random choice from homepage for baseline."
                 else:
                     logger.warning("No recommendations on homepage either. Ending experiment.")
+                    if pending_filter_log:
+                        log_persona_filter(*pending_filter_log)
                     break
             else:  # 'persona'
                 chosen_video = choose_video_with_llm(
@@ -342,28 +499,23 @@ def run_persona_phase(driver, session_id, personas: dict,
 
                 if chosen_video_id == "no_interesting_video":
                     logger.info("Ending experiment: no interesting video found on sidebar or homepage.")
+                    if pending_filter_log:
+                        log_persona_filter(*pending_filter_log)
                     break
 
 
         # --- UPDATE FOR NEXT LOOP ---
-        next_video_found = False
-        for rec in parsed_recs.recommendations:
-            if rec.video_id == chosen_video_id:
-                next_video_id = rec.video_id
-                next_video_duration = parse_duration(rec.duration)
-                next_video_found = True
-                break
-        
-        # If not found in sidebar recommendations, it might be from homepage
-        if not next_video_found and 'parsed_recs_homepage' in locals():
-            for rec in parsed_recs_homepage.recommendations:
-                if rec.video_id == chosen_video_id:
-                    next_video_id = rec.video_id
-                    next_video_duration = parse_duration(rec.duration)
-                    break
+        # parsed_recs already absorbed the homepage recommendations when that
+        # path ran, so one id-keyed dict replaces both scans (and the
+        # 'parsed_recs_homepage' in locals() probe)
+        recs_by_id = {rec.video_id: rec for rec in parsed_recs.recommendations}
+        chosen_rec = recs_by_id.get(chosen_video_id)
+        if chosen_rec is not None:
+            next_video_id = chosen_rec.video_id
+            next_video_duration = parse_duration(chosen_rec.duration)
 
         # --- LOGGING RESULTS ---
-        insert_video_and_recommendations(
+        insert_video_and_recommendations_async(
             session_id=session_id,
             depth=depth,
             source_video_id=source_video_id,
@@ -372,7 +524,8 @@ def run_persona_phase(driver, session_id, personas: dict,
             justification=justification,
             is_context=False,
             profile_id_at_choice=profile_id_for_choice,
-            choice_method=choice_method
+            choice_method=choice_method,
+            filter_log=pending_filter_log
         )
 
 
@@ -413,8 +566,15 @@ def main():
         elif exp_config.mode == 'sequential_persona':
             profile_ids_to_fetch.update(s.profile_id for s in exp_config.persona_sequence)
 
-        persona_descriptions_map = {pid: get_profile_data(pid) for pid in profile_ids_to_fetch}
+        persona_descriptions_map = {}
         if profile_ids_to_fetch:
+            # Profile rows are independent, so overlap the DB round trips
+            # instead of paying one latency per profile sequentially; each
+            # thread borrows its own pooled connection
+            profile_ids = list(profile_ids_to_fetch)
+            with ThreadPoolExecutor(max_workers=min(8, len(profile_ids))) as executor:
+                persona_descriptions_map = dict(
+                    zip(profile_ids, executor.map(get_profile_data, profile_ids)))
             logger.info(f"Loaded {len(persona_descriptions_map)} personas for the experiment.")
 
         # E. Create the session in the database, storing the full experiment config
@@ -426,9 +586,10 @@ def main():
         # F. Set up the browser
         time.sleep(5)  # Pause for enrichment worker to potentially catch up
         driver = setup_browser()
+        inject_consent_cookies(driver)
         driver.get("https://www.youtube.com/")
         time.sleep(5)
-        accept_cookies(driver)
+        accept_cookies(driver)  # Fallback in case the injected cookies were not honored
 
         # G. Run the context and persona phases
         start_video_id, start_duration, context_length = None, 0, len(video_context_ids)
@@ -442,6 +603,8 @@ def main():
         else:
             logger.info("No starting video from context phase; scraper will finish.")
 
+        # Make sure every queued step write has landed before declaring success
+        flush_async_writer()
         update_session_status(session_id, 'completed')
 
     except ContextNotFoundError as e:
@@ -454,6 +617,7 @@ def main():
     finally:
         if driver:
             driver.quit()
+        stop_async_writer()
         close_connection_pool()
         logger.info("--- Scraper Bot Finished ---")
 
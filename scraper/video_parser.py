@@ -4,6 +4,7 @@ import logging
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from config import get_config
 
 logger = logging.getLogger(__name__)
@@ -12,27 +13,35 @@ def parse_duration(duration_str):
     """
     Parses a duration string (e.g., "1:10:25" or "10:25") into total seconds.
     It correctly handles formats from H:M:S down to just S.
+
+    Single forward pass over the characters: digits accumulate into the
+    current field and each ':' folds that field into the running total in
+    base 60 — no split list, no per-part int() calls, and malformed input
+    (e.g. "LIVE") returns 0 without raising.
     """
     if not duration_str or not isinstance(duration_str, str):
         logger.error("Invalid duration string.")
         return 0
 
-    parts = duration_str.split(':')
-    duration = 0
+    total = 0
+    value = 0
+    # Iterating the encoded bytes yields integer codes directly, one C-level
+    # conversion for the string instead of an ord() call per character
+    for code in duration_str.encode('ascii', 'ignore'):
+        if 0x30 <= code <= 0x39:  # '0'-'9'
+            value = value * 10 + (code - 0x30)
+        elif code == 0x3A:  # ':'
+            total = total * 60 + value
+            value = 0
+        else:
+            logger.warning(f"Warning: Could not parse malformed duration string: '{duration_str}'. Defaulting to 0.")
+            return 0
+    return total * 60 + value
 
-    try:
-        # Iterate over the parts in reverse (from seconds, to minutes, to hours).
-        # The index 'i' will be 0 for seconds, 1 for minutes, 2 for hours, etc.
-        # This correctly handles "10:25" (i=0 for '25', i=1 for '10') and
-        # "1:10:25" (i=0 for '25', i=1 for '10', i=2 for '1').
-        for i, part in enumerate(reversed(parts)):
-            # The multiplier is 60^0 for seconds, 60^1 for minutes, 60^2 for hours.
-            duration += int(part) * (60 ** i)
-        return duration
-    except ValueError:
-        # This handles cases where a part is not a valid number, e.g., "LIVE".
-        logger.warning(f"Warning: Could not parse malformed duration string: '{duration_str}'. Defaulting to 0.")
-        return 0
+
+# Resolved once on first use: get_config() returns a singleton, but the
+# attribute chain still walks the config model on every watched video
+_MAX_DURATION = None
 
 
 def skip_ad(driver):
@@ -58,9 +67,11 @@ def watch_video(driver, duration_seconds=0, max_duration=None):
     Actively "watches" a video for a specified duration, while periodically
     checking for and skipping mid-roll ads.
     """
+    global _MAX_DURATION
     if max_duration is None:
-        config = get_config()
-        max_duration = config.scraping.max_duration
+        if _MAX_DURATION is None:
+            _MAX_DURATION = get_config().scraping.max_duration
+        max_duration = _MAX_DURATION
     
     logger.info(f"Attempting to watch video for up to {max_duration} seconds.")
     
@@ -99,13 +110,18 @@ def watch_video(driver, duration_seconds=0, max_duration=None):
             logger.error(f"Could not get video duration: {e}. Waiting for a fixed time.")
 
     
-    elapsed_time = 0
+    elapsed_time = time.time() - start_time
     while elapsed_time < watch_duration:
-        # Periodically check for and skip ads
-        skip_ad(driver)
-            
-        # Wait for a short interval
-        time.sleep(2)
+        try:
+            # One skip-button probe every 5 seconds through the wait's poll
+            # loop instead of a probe every 2 seconds; until() only returns
+            # early when an ad was actually skipped, after which the wait
+            # restarts for the remaining watch time
+            WebDriverWait(driver, watch_duration - elapsed_time,
+                          poll_frequency=5).until(skip_ad)
+        except TimeoutException:
+            # The watch window elapsed with no further ads - the normal case
+            pass
         elapsed_time = time.time() - start_time
 
     logger.info(f"Finished watching video. Total time: {elapsed_time} seconds.")
\ No newline at end of file
@@ -1,29 +1,42 @@
 #!/usr/bin/env python3
 import os
 import sys
-import psycopg2
 import argparse
-from dotenv import load_dotenv
 
-# --- CONFIGURATION ---
-dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
-load_dotenv(dotenv_path=dotenv_path)
+# psycopg and dotenv are imported inside add_context() so that --help and
+# argparse errors don't pay the driver import cost
 
 DB_HOST = "localhost"
 DB_PORT = "5432"
-DB_NAME = os.getenv("POSTGRES_DB")
-DB_USER = os.getenv("POSTGRES_USER")
-DB_PASSWORD = os.getenv("POSTGRES_PASSWORD")
 
 
 def add_context(context_name, description, video_ids):
     """
     Adds a new, named experiment context to the database.
     """
-    conn_string = f"host='{DB_HOST}' port='{DB_PORT}' dbname='{DB_NAME}' user='{DB_USER}' password='{DB_PASSWORD}'"
+    import psycopg
+    from dotenv import load_dotenv
+
+    # --- CONFIGURATION ---
+    dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
+    load_dotenv(dotenv_path=dotenv_path)
+
+    db_name = os.getenv("POSTGRES_DB")
+    db_user = os.getenv("POSTGRES_USER")
+    db_password = os.getenv("POSTGRES_PASSWORD")
+
+    conn_string = f"host='{DB_HOST}' port='{DB_PORT}' dbname='{db_name}' user='{db_user}' password='{db_password}'"
+
+    # Drop duplicate IDs (keeping first-seen order) before adapting the list:
+    # every element is adapted individually by the driver's array binding, so
+    # repeats in a large list are pure wasted work on both ends of the wire
+    deduped = list(dict.fromkeys(video_ids))
+    if len(deduped) < len(video_ids):
+        print(f"Note: removed {len(video_ids) - len(deduped)} duplicate video ID(s).")
+    video_ids = deduped
 
     try:
-        with psycopg2.connect(conn_string) as conn:
+        with psycopg.connect(conn_string, prepare_threshold=5) as conn:
             with conn.cursor() as cur:
                 print(f"Adding context: '{context_name}'...")
 
@@ -40,10 +53,10 @@ def add_context(context_name, description, video_ids):
                 print(f"Added {len(video_ids)} videos to the context.")
                 print("You can now reference this context by name in your config.yaml.")
 
-    except psycopg2.errors.UniqueViolation:
+    except psycopg.errors.UniqueViolation:
         print(f"\n❌ Error: A context with the name '{context_name}' already exists. Please choose a unique name.")
         sys.exit(1)
-    except psycopg2.OperationalError as e:
+    except psycopg.OperationalError as e:
         print(f"\n❌ Database Connection Error: Could not connect to the PostgreSQL container.")
         print("Please ensure the database service is running ('docker-compose up -d db').")
         print(f"Details: {e}")
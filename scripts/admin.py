@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unified admin CLI for the research database.
+
+Wraps the four standalone admin scripts behind one entrypoint with
+subcommands:
+
+    python scripts/admin.py list-profiles
+    python scripts/admin.py add-context --name ... --desc ... --videos ID [ID ...]
+    python scripts/admin.py --repl
+
+The driver and .env loading are imported lazily inside each subcommand
+handler, so `admin.py --help` never touches the database stack. --repl
+reads subcommands from stdin in a loop, paying interpreter startup and
+imports once for a whole sequence of admin actions.
+
+The standalone scripts keep working unchanged; this is a front door,
+not a replacement.
+"""
+import argparse
+import shlex
+import sys
+
+
+def _run_list_profiles(args):
+    from list_profiles import list_profiles
+    list_profiles()
+
+
+def _run_list_contexts(args):
+    from list_contexts import list_contexts
+    list_contexts()
+
+
+def _run_add_profile(args):
+    from add_profile import add_profile
+    add_profile(args.name, args.desc)
+
+
+def _run_add_context(args):
+    from add_context import add_context
+    add_context(args.name, args.desc, args.videos)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="admin.py",
+        description="Manage profiles and contexts in the YouTube Analysis database."
+    )
+    parser.add_argument(
+        "--repl",
+        action="store_true",
+        help="Read subcommands from stdin in a loop instead of running one and exiting."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    sub = subparsers.add_parser("list-profiles", help="List all user persona profiles.")
+    sub.set_defaults(func=_run_list_profiles)
+
+    sub = subparsers.add_parser("list-contexts", help="List all experiment contexts.")
+    sub.set_defaults(func=_run_list_contexts)
+
+    sub = subparsers.add_parser("add-profile", help="Add a new user persona profile.")
+    sub.add_argument("--name", required=True,
+                     help="The unique name for the new profile (e.g., 'News Junkie').")
+    sub.add_argument("--desc", required=True,
+                     help="A detailed description of the user persona's interests and behaviors.")
+    sub.set_defaults(func=_run_add_profile)
+
+    sub = subparsers.add_parser("add-context", help="Add a new named list of video IDs.")
+    sub.add_argument("--name", required=True,
+                     help="The unique name for this context (e.g., 'Initial Tech Exploration').")
+    sub.add_argument("--desc", required=True,
+                     help="A brief description of what this context represents or is used for.")
+    sub.add_argument("--videos", nargs='+', required=True, metavar="VIDEO_ID",
+                     help="A space-separated list of YouTube video IDs.")
+    sub.set_defaults(func=_run_add_context)
+
+    return parser
+
+
+def repl(parser):
+    """Run subcommands from stdin until EOF or 'quit'."""
+    print("Admin REPL - one subcommand per line, 'quit' or Ctrl-D to exit.")
+    for line in sys.stdin:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line in ('quit', 'exit'):
+            break
+        try:
+            args = parser.parse_args(shlex.split(line))
+        except SystemExit:
+            # argparse already printed the usage error; keep the loop alive
+            continue
+        if getattr(args, 'func', None) is None:
+            parser.print_help()
+            continue
+        try:
+            args.func(args)
+        except SystemExit:
+            # The wrapped scripts sys.exit(1) on DB errors; in the REPL an
+            # error in one action should not kill the session
+            continue
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.repl:
+        repl(parser)
+    elif getattr(args, 'func', None):
+        args.func(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,48 +9,67 @@ Usage:
     python export_db.py --format csv --output exports/
     python export_db.py --format json --tables videos,sessions
     python export_db.py --format sql --output backup.sql
+    python export_db.py --format parquet --output exports/
 """
 
 import argparse
 import os
 import sys
-import json
-import csv
-from datetime import datetime
 from pathlib import Path
-import psycopg2
-import psycopg2.extras
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# The database stack (psycopg + pool, orjson, dotenv) is imported inside
+# DatabaseExporter and the export methods rather than here: `--help` and
+# argument errors then never pay the ~100ms driver import. Python caches
+# modules, so the repeated function-level imports are one dict lookup
+# after the first call.
+
 
 class DatabaseExporter:
     def __init__(self, host='localhost', port=5432, database=None, user=None, password=None):
+        import psycopg
+        from psycopg_pool import ConnectionPool, PoolTimeout
+        from dotenv import load_dotenv
+
+        # Load environment variables
+        load_dotenv()
+
         self.host = host
         self.port = port
         self.database = database or os.getenv('POSTGRES_DB', 'youtube_research')
         self.user = user or os.getenv('POSTGRES_USER', 'yt_user')
         self.password = password or os.getenv('POSTGRES_PASSWORD')
-        
+
         if not self.password:
             raise ValueError("Database password not found. Set POSTGRES_PASSWORD in .env or pass as argument")
-    
-    def connect(self):
-        """Establish database connection"""
-        try:
-            conn = psycopg2.connect(
+
+        # One pool for the whole run instead of a fresh TCP+auth handshake
+        # per export method; max_size bounds how many tables can stream at
+        # once when exports run concurrently.
+        # prepare_threshold: repeated statements (one per exported table)
+        # get server-side prepared after a few executions
+        self.pool = ConnectionPool(
+            conninfo=psycopg.conninfo.make_conninfo(
                 host=self.host,
                 port=self.port,
-                database=self.database,
+                dbname=self.database,
                 user=self.user,
-                password=self.password
-            )
-            return conn
-        except psycopg2.Error as e:
+                password=self.password,
+            ),
+            kwargs={'prepare_threshold': 5},
+            min_size=1,
+            max_size=4,
+            open=False,
+        )
+        try:
+            self.pool.open(wait=True, timeout=10)
+        except PoolTimeout as e:
             print(f"Error connecting to database: {e}")
             sys.exit(1)
-    
+
+    def connect(self):
+        """Check out a pooled connection (context manager)"""
+        return self.pool.connection()
+
     def get_table_names(self):
         """Get all table names from the database"""
         with self.connect() as conn:
@@ -64,93 +83,242 @@ class DatabaseExporter:
                 """)
                 return [row[0] for row in cur.fetchall()]
     
-    def export_to_csv(self, output_dir, tables=None):
+    def _export_one_csv(self, table, output_path, compress='none'):
+        """Export a single table to its CSV file on its own pooled connection"""
+        from psycopg import sql
+
+        # Postgres CSV output compresses 4-8x, so gzipping the COPY stream
+        # in-process trades a little CPU for far fewer bytes hitting disk
+        # and any later transfer
+        if compress == 'gzip':
+            import gzip
+            csv_file = output_path / f"{table}.csv.gz"
+            sink = gzip.open(csv_file, 'wb', compresslevel=6)
+        else:
+            csv_file = output_path / f"{table}.csv"
+            sink = open(csv_file, 'wb')
+
+        # COPY makes the server emit CSV natively: no per-row Python
+        # decoding, dict construction or csv re-encoding, and json/
+        # array columns arrive already serialized. The file is opened
+        # in binary mode because COPY hands back raw bytes.
+        with self.connect() as conn:
+            with conn.cursor() as cur, sink as f:
+                with cur.copy(
+                    sql.SQL("COPY (SELECT * FROM {tbl}) TO STDOUT WITH CSV HEADER")
+                    .format(tbl=sql.Identifier(table))
+                ) as copy:
+                    for data in copy:
+                        f.write(data)
+                return csv_file, cur.rowcount
+
+    def export_to_csv(self, output_dir, tables=None, compress='none'):
         """Export tables to CSV files"""
+        from concurrent.futures import ThreadPoolExecutor
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            tqdm = None
+
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
-        
+
         tables = tables or self.get_table_names()
-        
-        with self.connect() as conn:
-            for table in tables:
-                print(f"Exporting {table} to CSV...")
-                
-                with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
-                    # First get column names from the table schema
-                    cur.execute("""
-                        SELECT column_name 
-                        FROM information_schema.columns 
-                        WHERE table_name = %s 
-                        ORDER BY ordinal_position
-                    """, (table,))
-                    column_names = [row[0] for row in cur.fetchall()]
-                    
-                    # Now get the actual data
-                    cur.execute(f"SELECT * FROM {table}")
-                    rows = cur.fetchall()
-                    
-                    if not rows:
-                        print(f"  Warning: {table} is empty")
-                        continue
-                    
-                    csv_file = output_path / f"{table}.csv"
-                    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=column_names)
-                        writer.writeheader()
-                        for row in rows:
-                            # Convert any non-serializable types to strings
-                            clean_row = {}
-                            for key in column_names:
-                                value = row.get(key)
-                                if isinstance(value, (list, dict)):
-                                    clean_row[key] = json.dumps(value)
-                                else:
-                                    clean_row[key] = value
-                            writer.writerow(clean_row)
-                    
-                    print(f"  Exported {len(rows)} rows to {csv_file}")
+
+        # Tables stream concurrently, each thread owning its own pooled
+        # connection and output file; the GIL is released during libpq I/O
+        # so wall-clock approaches the slowest table instead of the sum
+        with ThreadPoolExecutor(max_workers=min(len(tables), 4)) as executor:
+            futures = [
+                executor.submit(self._export_one_csv, table, output_path, compress)
+                for table in tables
+            ]
+            progress = tqdm(futures, desc="Exporting CSV", unit="table") if tqdm else futures
+            summary = []
+            for table, future in zip(tables, progress):
+                csv_file, row_count = future.result()
+                if row_count == 0:
+                    summary.append(f"  Warning: {table} is empty\n")
+                summary.append(f"  Exported {row_count} rows to {csv_file}\n")
+
+        # One buffered write instead of a flushed print per table
+        sys.stdout.write("".join(summary))
     
     def export_to_json(self, output_file, tables=None):
         """Export tables to JSON file"""
+        import orjson
+        from psycopg import sql
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            tqdm = None
+
         tables = tables or self.get_table_names()
-        data = {}
-        
-        with self.connect() as conn:
-            for table in tables:
-                print(f"Exporting {table} to JSON...")
-                
-                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                    cur.execute(f"SELECT * FROM {table}")
-                    rows = cur.fetchall()
-                    
-                    # Convert to JSON-serializable format
-                    json_rows = []
-                    for row in rows:
-                        json_row = {}
-                        for key, value in row.items():
-                            if isinstance(value, datetime):
-                                json_row[key] = value.isoformat()
-                            else:
-                                json_row[key] = value
-                        json_rows.append(json_row)
-                    
-                    data[table] = json_rows
-                    print(f"  Exported {len(rows)} rows from {table}")
-        
-        # Write to file
+
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        print(f"JSON export completed: {output_path}")
+
+        # The document is written incrementally - one table at a time, one row
+        # at a time from a server-side cursor - so peak memory is one row
+        # rather than the whole database. orjson emits bytes, hence the
+        # binary-mode file; it serializes datetimes natively, so no
+        # per-column converters are needed at all
+        table_iter = tqdm(tables, desc="Exporting JSON", unit="table") if tqdm else tables
+        summary = []
+        with self.connect() as conn, open(output_path, 'wb') as f:
+            f.write(b'{')
+            for table_index, table in enumerate(table_iter):
+                if table_index:
+                    f.write(b',')
+                f.write(b'\n' + orjson.dumps(table) + b': [')
+
+                with conn.cursor(name=f"export_json_{table}") as cur:
+                    cur.itersize = 10000
+                    cur.execute(sql.SQL("SELECT * FROM {tbl}")
+                                .format(tbl=sql.Identifier(table)))
+
+                    columns = [col.name for col in cur.description]
+
+                    row_count = 0
+                    for row in cur:
+                        f.write(b',\n' if row_count else b'\n')
+                        f.write(orjson.dumps(dict(zip(columns, row)),
+                                             option=orjson.OPT_NAIVE_UTC,
+                                             default=str))
+                        row_count += 1
+
+                f.write(b'\n]' if row_count else b']')
+                summary.append(f"  Exported {row_count} rows from {table}\n")
+            f.write(b'\n}\n')
+
+        # One buffered write instead of a flushed print per table
+        summary.append(f"JSON export completed: {output_path}\n")
+        sys.stdout.write("".join(summary))
     
-    def export_to_sql(self, output_file, tables=None):
+    def export_to_parquet(self, output_dir, tables=None):
+        """Export tables to Parquet files (requires pyarrow)"""
+        from psycopg import sql
+        from psycopg.postgres import types as pg_types
+        from psycopg.types.string import TextLoader
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("pyarrow is required for parquet export. Install it with 'pip install pyarrow'.")
+            sys.exit(1)
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            tqdm = None
+
+        # Arrow types for Postgres columns, used wherever a column gives
+        # schema inference nothing to work with (all-NULL first batch,
+        # empty table); anything not listed serializes fine as a string
+        pg_scalar_types = {
+            'int2': pa.int16(), 'int4': pa.int32(), 'int8': pa.int64(),
+            'float4': pa.float32(), 'float8': pa.float64(),
+            'numeric': pa.float64(),
+            'bool': pa.bool_(),
+            'bytea': pa.binary(),
+            'timestamp': pa.timestamp('us'),
+            'timestamptz': pa.timestamp('us', tz='UTC'),
+            'date': pa.date32(),
+        }
+
+        def column_arrow_type(col):
+            info = pg_types.get(col.type_code)
+            if info is None:
+                return pa.string()
+            scalar = pg_scalar_types.get(info.name, pa.string())
+            if col.type_code == info.array_oid:
+                return pa.list_(scalar)
+            return scalar
+
+        def needs_widening(arrow_type):
+            return pa.types.is_null(arrow_type) or (
+                pa.types.is_list(arrow_type)
+                and pa.types.is_null(arrow_type.value_type)
+            )
+
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        tables = tables or self.get_table_names()
+
+        table_iter = tqdm(tables, desc="Exporting Parquet", unit="table") if tqdm else tables
+        summary = []
+        with self.connect() as conn:
+            # Keep json/jsonb as raw strings: their Python dict/list form
+            # would make pyarrow infer per-chunk struct schemas that rarely
+            # unify across rows
+            conn.adapters.register_loader('json', TextLoader)
+            conn.adapters.register_loader('jsonb', TextLoader)
+
+            for table in table_iter:
+                parquet_file = output_path / f"{table}.parquet"
+                with conn.cursor(name=f"export_parquet_{table}") as cur:
+                    cur.itersize = 10000
+                    cur.execute(sql.SQL("SELECT * FROM {tbl}")
+                                .format(tbl=sql.Identifier(table)))
+                    columns = [col.name for col in cur.description]
+
+                    # Chunked fetch keeps memory at one batch; the first
+                    # chunk's inferred schema fixes the file schema and
+                    # later chunks are cast to it
+                    writer = None
+                    row_count = 0
+                    while True:
+                        rows = cur.fetchmany(cur.itersize)
+                        if not rows:
+                            break
+                        chunk = pa.Table.from_pydict({
+                            name: list(col)
+                            for name, col in zip(columns, zip(*rows))
+                        })
+                        if writer is None:
+                            # A nullable column that is all-NULL in the
+                            # first batch is inferred as Arrow's null type,
+                            # and later batches with real values cannot be
+                            # cast down to it - widen such fields to the
+                            # type the Postgres column implies before the
+                            # schema is frozen into the writer
+                            schema = chunk.schema
+                            for index, col in enumerate(cur.description):
+                                field = schema.field(index)
+                                if needs_widening(field.type):
+                                    schema = schema.set(
+                                        index,
+                                        field.with_type(column_arrow_type(col))
+                                    )
+                            chunk = chunk.cast(schema)
+                            writer = pq.ParquetWriter(parquet_file, schema,
+                                                      compression='zstd')
+                        else:
+                            chunk = chunk.cast(writer.schema)
+                        writer.write_table(chunk)
+                        row_count += chunk.num_rows
+
+                    if writer is None:
+                        # Empty table: still emit a file carrying the
+                        # columns, typed from the catalog
+                        schema = pa.schema([
+                            (col.name, column_arrow_type(col))
+                            for col in cur.description
+                        ])
+                        writer = pq.ParquetWriter(parquet_file, schema,
+                                                  compression='zstd')
+                        writer.write_table(schema.empty_table())
+                        summary.append(f"  Warning: {table} is empty\n")
+                    writer.close()
+                    summary.append(f"  Exported {row_count} rows to {parquet_file}\n")
+
+        sys.stdout.write("".join(summary))
+
+    def export_to_sql(self, output_file, tables=None, jobs=1):
         """Export database schema and data to SQL file"""
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        
+
         # Use pg_dump for complete SQL export
         cmd = [
             'pg_dump',
@@ -159,25 +327,39 @@ class DatabaseExporter:
             f'--username={self.user}',
             f'--dbname={self.database}',
             '--no-password',
-            '--verbose',
             '--clean',
             '--if-exists',
             '--create'
         ]
-        
+
+        if jobs > 1:
+            # Directory format is the only one pg_dump can write with
+            # parallel workers; per-table data files are compressed as they
+            # are dumped, so this cuts both wall time and disk
+            cmd.extend([
+                '--format=directory',
+                f'--jobs={jobs}',
+                '--compress=6',
+                f'--file={output_path}',
+            ])
+
         if tables:
             for table in tables:
                 cmd.extend(['--table', table])
-        
+
         # Set password via environment variable
         env = os.environ.copy()
         env['PGPASSWORD'] = self.password
-        
+
         try:
             import subprocess
-            with open(output_path, 'w') as f:
-                result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, 
-                                      env=env, text=True, check=True)
+            if jobs > 1:
+                subprocess.run(cmd, stderr=subprocess.PIPE,
+                               env=env, text=True, check=True)
+            else:
+                with open(output_path, 'w') as f:
+                    result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE,
+                                          env=env, text=True, check=True)
             print(f"SQL export completed: {output_path}")
         except subprocess.CalledProcessError as e:
             print(f"Error running pg_dump: {e.stderr}")
@@ -189,12 +371,19 @@ class DatabaseExporter:
 
 def main():
     parser = argparse.ArgumentParser(description='Export YouTube Research Database')
-    parser.add_argument('--format', choices=['csv', 'json', 'sql'], required=True,
-                       help='Export format')
+    parser.add_argument('--format', choices=['csv', 'json', 'sql', 'parquet'], required=True,
+                       help='Export format (parquet requires pyarrow)')
     parser.add_argument('--output', required=True,
                        help='Output file or directory')
-    parser.add_argument('--tables', 
+    parser.add_argument('--tables',
                        help='Comma-separated list of tables to export (default: all)')
+    parser.add_argument('--compress', choices=['none', 'gzip'], default='none',
+                       help='Compress CSV export output; gzip writes .csv.gz '
+                            'files (default: none)')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Parallel pg_dump workers for SQL export; values > 1 '
+                            'write a directory-format archive to --output instead '
+                            'of a plain .sql file (default: 1)')
     parser.add_argument('--host', default='localhost',
                        help='Database host (default: localhost)')
     parser.add_argument('--port', type=int, default=5432,
@@ -226,16 +415,29 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
     
+    # Refuse table names that don't exist in the database: every format
+    # interpolates them into SQL or pg_dump argv, so only catalog-verified
+    # names may pass, and a typo fails loudly instead of exporting nothing
+    if tables:
+        known_tables = set(exporter.get_table_names())
+        unknown_tables = [t for t in tables if t not in known_tables]
+        if unknown_tables:
+            print(f"Error: unknown table(s): {', '.join(unknown_tables)}")
+            print(f"Available tables: {', '.join(sorted(known_tables))}")
+            sys.exit(1)
+
     # Perform export
     print(f"Starting {args.format.upper()} export...")
     print(f"Database: {exporter.database}@{exporter.host}:{exporter.port}")
     
     if args.format == 'csv':
-        exporter.export_to_csv(args.output, tables)
+        exporter.export_to_csv(args.output, tables, compress=args.compress)
     elif args.format == 'json':
         exporter.export_to_json(args.output, tables)
     elif args.format == 'sql':
-        exporter.export_to_sql(args.output, tables)
+        exporter.export_to_sql(args.output, tables, jobs=args.jobs)
+    elif args.format == 'parquet':
+        exporter.export_to_parquet(args.output, tables)
     
     print("Export completed successfully!")
 
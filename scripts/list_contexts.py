@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import os
 import sys
-import psycopg2
+import psycopg
 from dotenv import load_dotenv
 
 # --- CONFIGURATION ---
@@ -23,15 +23,17 @@ def list_contexts():
     conn_string = f"host='{DB_HOST}' port='{DB_PORT}' dbname='{DB_NAME}' user='{DB_USER}' password='{DB_PASSWORD}'"
 
     try:
-        with psycopg2.connect(conn_string) as conn:
+        with psycopg.connect(conn_string, prepare_threshold=5) as conn:
             with conn.cursor() as cur:
-                # Updated query to also fetch the video_ids array itself
+                # video_ids[1:3] slices the array server-side: only the
+                # three sample IDs ever cross the wire, however large the
+                # context actually is
                 query = """
                         SELECT context_id, \
                                context_name, \
                                description, \
                                cardinality(video_ids) as video_count, \
-                               video_ids
+                               video_ids[1:3]
                         FROM experiment_contexts
                         ORDER BY context_id; \
                         """
@@ -44,16 +46,30 @@ def list_contexts():
                     return
 
                 print("\n--- Available Experiment Contexts ---")
-                # Define column widths, adding one for the video IDs
-                id_width = 4
-                name_width = 25
-                count_width = 8
-                desc_width = 45
-                videos_width = 40  # Width for the new video IDs column
+                # Size the columns to the data - everything is already in
+                # memory, so one max() pass beats hardcoded widths that
+                # either truncate or waste space. The description column
+                # absorbs whatever terminal width remains.
+                import shutil
+                id_width = max(2, max(len(str(c[0])) for c in contexts))
+                name_width = max(len('Name'), max(len(c[1]) for c in contexts))
+                count_width = len('# Videos')
+                videos_width = 40  # Width for the video IDs column
+                terminal_width = shutil.get_terminal_size().columns
+                desc_width = max(
+                    20,
+                    terminal_width - id_width - name_width - count_width
+                    - videos_width - 12
+                )
+
+                # The row format is built once instead of re-parsing an
+                # f-string format spec per row
+                row_fmt = (f"{{:<{id_width}}} | {{:<{name_width}}} | {{:<{count_width}}} | "
+                           f"{{:<{desc_width}}} | {{}}")
 
                 # Print header
-                header = (f"{'ID':<{id_width}} | {'Name':<{name_width}} | {'# Videos':<{count_width}} | "
-                          f"{'Description':<{desc_width}} | {'Video IDs (Sample)'}")
+                header = row_fmt.format('ID', 'Name', '# Videos', 'Description',
+                                        'Video IDs (Sample)')
                 print(header)
                 print("-" * len(header))
 
@@ -64,22 +80,26 @@ def list_contexts():
                         description = description[:desc_width - 3] + "..."
 
                     # --- Format the video IDs list for display ---
+                    # video_ids holds at most the three sampled elements;
+                    # video_count still reflects the full array
                     video_sample_str = ""
                     if video_ids:
-                        video_sample_str = str(video_ids)
+                        video_sample_str = ", ".join(video_ids)
+                        if video_count > 3:
+                            video_sample_str += ", ..."
 
                     # Truncate the final string if it's too long
                     if len(video_sample_str) > videos_width - 3:
                         video_sample_str = video_sample_str[:videos_width - 3] + "..."
 
-                    print(f"{context_id:<{id_width}} | {name:<{name_width}} | {video_count:<{count_width}} | "
-                          f"{description:<{desc_width}} | {video_sample_str}")
+                    print(row_fmt.format(context_id, name, video_count,
+                                         description, video_sample_str))
 
                 print("-" * len(header))
                 print(f"Found {len(contexts)} contexts.\n")
 
 
-    except psycopg2.OperationalError as e:
+    except psycopg.OperationalError as e:
         print(f"\n❌ Database Connection Error: Could not connect to the PostgreSQL container.", file=sys.stderr)
         print("Please ensure the database service is running ('docker-compose up -d db').", file=sys.stderr)
         print(f"Details: {e}", file=sys.stderr)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import os
 import sys
-import psycopg2
+import psycopg
 from dotenv import load_dotenv
 
 # --- CONFIGURATION ---
@@ -22,7 +22,7 @@ def list_profiles():
     conn_string = f"host='{DB_HOST}' port='{DB_PORT}' dbname='{DB_NAME}' user='{DB_USER}' password='{DB_PASSWORD}'"
 
     try:
-        with psycopg2.connect(conn_string) as conn:
+        with psycopg.connect(conn_string, prepare_threshold=5) as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT profile_id, profile_name, persona_description FROM profiles ORDER BY profile_id;")
                 profiles = cur.fetchall()
@@ -33,13 +33,22 @@ def list_profiles():
                     return
 
                 print("\n--- Available User Personas ---")
-                # Define column widths
-                id_width = 1
-                name_width = 28
-                desc_width = 100
+                # Size the columns to the data - everything is already in
+                # memory, so one max() pass beats hardcoded widths that
+                # either truncate or waste space. The description column
+                # absorbs whatever terminal width remains.
+                import shutil
+                id_width = max(2, max(len(str(p[0])) for p in profiles))
+                name_width = max(len('Name'), max(len(p[1]) for p in profiles))
+                terminal_width = shutil.get_terminal_size().columns
+                desc_width = max(20, terminal_width - id_width - name_width - 6)
+
+                # The row format is built once instead of re-parsing an
+                # f-string format spec per row
+                row_fmt = f"{{:<{id_width}}} | {{:<{name_width}}} | {{}}"
 
                 # Print header
-                print(f"{'ID':<{id_width}} | {'Name':<{name_width}} | {'Description'}")
+                print(row_fmt.format('ID', 'Name', 'Description'))
                 print("-" * (id_width + name_width + desc_width + 5))
 
                 # Print rows
@@ -48,12 +57,12 @@ def list_profiles():
                     if len(description) > desc_width - 3:
                         description = description[:desc_width - 3] + "..."
 
-                    print(f"{profile_id:<{id_width}} | {name:<{name_width}} | {description}")
+                    print(row_fmt.format(profile_id, name, description))
                 print("-" * (id_width + name_width + desc_width + 5))
                 print(f"Found {len(profiles)} profiles.\n")
 
 
-    except psycopg2.OperationalError as e:
+    except psycopg.OperationalError as e:
         print(f"\n❌ Database Connection Error: Could not connect to the PostgreSQL container.", file=sys.stderr)
         print("Please ensure the database service is running ('docker-compose up -d db').", file=sys.stderr)
         print(f"Details: {e}", file=sys.stderr)